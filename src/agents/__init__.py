@@ -4,15 +4,33 @@ Agents module for the Task Manager application.
 Contains AI agent implementations for business analysis, employee evaluation, and task processing.
 """
 
-from .ba_agent import run_ba_agent
-from .employee_agent import load_employees, create_employee_agent
-from .base_agent import BaseAgent
-from .task_agent import batch_task_processing  # Assuming task_agent.py will contain this
+import importlib
+from typing import Any
 
-__all__ = [
-    "run_ba_agent",
-    "load_employees",
-    "create_employee_agent",
-    "BaseAgent",
-    "batch_task_processing",
-]
\ No newline at end of file
+# Public name -> submodule; submodules (and crewai/LLM clients) load on first attribute access (PEP 562)
+_EXPORTS = {
+    "run_ba_agent": ".ba_agent",
+    "load_employees": ".employee_agent",
+    "load_employee_directory": ".employee_agent",
+    "EmployeeDirectory": ".employee_agent",
+    "create_employee_agent": ".employee_agent",
+    "evaluate_task_batch": ".employee_agent",
+    "BaseAgent": ".base_agent",
+    "batch_task_processing": ".task_agent",
+    "batch_task_processing_async": ".task_agent",
+    "batch_task_processing_many": ".task_agent",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name: str) -> Any:
+    """Import the submodule defining `name` on first access and cache the attribute."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> list:
+    return sorted(list(globals()) + __all__)
\ No newline at end of file
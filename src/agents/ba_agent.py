@@ -3,26 +3,130 @@
 Business Analyst agent for analyzing CEO requirements and generating structured project plans.
 """
 
-from crewai import Agent, Task, Crew
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
+from functools import lru_cache, cache
 import logging
-import json
-from src.config.llm_config import llm
-from src.utils.utils import parse_json_output, call_with_retry
+import orjson
+from src.config.llm_config import get_default_llm
+from src.config import USE_CREW
+from src.utils.utils import parse_json_output, run_crew, normalize_prompt, direct_llm, build_system_prompt
+from src.utils.cache import SemanticCache
+
+if TYPE_CHECKING:
+    from crewai import Agent
 
 logger = logging.getLogger(__name__)
 
-def create_ba_agent() -> Agent:
+# Paraphrased requirements reuse the stored analysis instead of a new LLM round-trip
+_BA_CACHE = SemanticCache("ba_agent")
+
+_BA_ROLE = "Business Analyst"
+_BA_GOAL = "Analyze CEO requirements and produce a structured technical plan with resource allocation."
+_BA_BACKSTORY = "An expert in translating high-level startup goals into actionable technical plans across tech, legal, finance, and marketing domains."
+_BA_SYSTEM_PROMPT = build_system_prompt(_BA_ROLE, _BA_GOAL, _BA_BACKSTORY)
+
+# Prompt is assembled by concatenation around the requirement instead of re-formatting per call
+_BA_PROMPT_HEAD = "Analyze this CEO requirement: '"
+_BA_PROMPT_TAIL = (
+    "'. "
+    "Generate a JSON object with: "
+    "- 'technical_spec' (string): Detailed technical overview "
+    "- 'tasks' (list of strings): Specific tasks to complete "
+    "- 'dependencies' (list of strings): External or internal dependencies "
+    "- 'skills' (list of strings): Required skills "
+    "- 'resources' (dict): Keys 'tech', 'legal', 'finance', 'marketing' with lists of needs. "
+    "Return a valid JSON string."
+)
+
+# Shape of a usable BA result: each required key and the type downstream steps expect
+_BA_SCHEMA = (
+    ("technical_spec", str),
+    ("tasks", list),
+    ("dependencies", list),
+    ("skills", list),
+    ("resources", dict),
+)
+
+def _validate_ba_output(parsed_result: Optional[dict]) -> None:
+    """
+    Check a parsed BA result against _BA_SCHEMA.
+
+    Args:
+        parsed_result: Output of parse_json_output.
+
+    Raises:
+        ValueError: If the result is missing, lacks a required key, or has a value of the wrong type.
+    """
+    if not parsed_result:
+        raise ValueError("LLM output is not a JSON object")
+    for key, expected_type in _BA_SCHEMA:
+        if not isinstance(parsed_result.get(key), expected_type):
+            raise ValueError(f"'{key}' is missing or not a {expected_type.__name__}")
+
+def _ba_output_valid(raw_result: str) -> bool:
+    """Return True if raw_result is a BA result that passes _validate_ba_output, so it may be cached."""
+    try:
+        _validate_ba_output(parse_json_output(raw_result.strip()))
+    except ValueError:
+        return False
+    return True
+
+def create_ba_agent() -> "Agent":
     """Create a Business Analyst agent instance."""
+    from crewai import Agent
+
     return Agent(
-        role="Business Analyst",
-        goal="Analyze CEO requirements and produce a structured technical plan with resource allocation.",
-        backstory="An expert in translating high-level startup goals into actionable technical plans across tech, legal, finance, and marketing domains.",
-        llm=llm,
+        role=_BA_ROLE,
+        goal=_BA_GOAL,
+        backstory=_BA_BACKSTORY,
+        llm=get_default_llm(),
         verbose=True,
         max_iter=15,  # Limit iterations to prevent infinite loops
     )
 
+@cache
+def _shared_ba_agent() -> "Agent":
+    """Return the BA agent shared by all crew runs; crewai agents hold no per-run state."""
+    return create_ba_agent()
+
+@lru_cache(maxsize=1024)
+def _ba_call(ceo_input_normalized: str) -> str:
+    """
+    Run the BA crew for a normalized requirement and return its validated JSON string.
+
+    Args:
+        ceo_input_normalized: The CEO's requirement after normalize_prompt.
+
+    Returns:
+        The raw JSON string produced by the LLM.
+
+    Raises:
+        ValueError: If the LLM output is not JSON with all required keys; such results are not cached.
+    """
+    cached = _BA_CACHE.get(ceo_input_normalized)
+    if cached is not None:
+        logger.info(f"Returning cached BA result for '{ceo_input_normalized}'")
+        return cached
+
+    description = _BA_PROMPT_HEAD + ceo_input_normalized + _BA_PROMPT_TAIL
+    if USE_CREW:
+        from crewai import Task, Crew
+
+        ba_agent = _shared_ba_agent()
+        task = Task(description=description, expected_output="A valid JSON string", agent=ba_agent)
+        crew = Crew(agents=[ba_agent], tasks=[task])
+        raw_result = run_crew(crew, _ba_output_valid)
+    else:
+        raw_result = direct_llm(_BA_SYSTEM_PROMPT, description, _ba_output_valid).strip()
+
+    try:
+        _validate_ba_output(parse_json_output(raw_result))
+    except ValueError as e:
+        raise ValueError(f"Invalid or incomplete JSON from LLM ({e}): {raw_result[:200]}...") from e
+
+    _BA_CACHE.set(ceo_input_normalized, raw_result)
+    return raw_result
+
 def run_ba_agent(ceo_input: str) -> Optional[str]:
     """
     Analyze CEO input and return a JSON string with technical specs and resources.
@@ -38,44 +142,23 @@ def run_ba_agent(ceo_input: str) -> Optional[str]:
         return None
 
     logger.info(f"Processing CEO requirement: '{ceo_input}'")
-    ba_agent = create_ba_agent()
-    task = Task(
-        description=(
-            f"Analyze this CEO requirement: '{ceo_input}'. "
-            "Generate a JSON object with: "
-            "- 'technical_spec' (string): Detailed technical overview "
-            "- 'tasks' (list of strings): Specific tasks to complete "
-            "- 'dependencies' (list of strings): External or internal dependencies "
-            "- 'skills' (list of strings): Required skills "
-            "- 'resources' (dict): Keys 'tech', 'legal', 'finance', 'marketing' with lists of needs. "
-            "Return a valid JSON string."
-        ),
-        expected_output="A valid JSON string",
-        agent=ba_agent,
-    )
-    crew = Crew(agents=[ba_agent], tasks=[task])
-
     try:
-        result = call_with_retry(crew)
-        raw_result = result.raw.strip()
-        parsed_result = parse_json_output(raw_result)
-
-        if not parsed_result or not all(key in parsed_result for key in ["technical_spec", "tasks", "dependencies", "skills", "resources"]):
-            logger.warning(f"Invalid or incomplete JSON from LLM: {raw_result[:200]}...")
-            # Fallback: Return a minimal valid structure
-            fallback = {
-                "technical_spec": f"Basic implementation for {ceo_input}",
-                "tasks": [f"Implement {ceo_input}"],
-                "dependencies": [],
-                "skills": [],
-                "resources": {"tech": [], "legal": [], "finance": [], "marketing": []}
-            }
-            raw_result = json.dumps(fallback)
-            logger.info("Applied fallback JSON structure.")
-
-        logger.info(f"BA Agent result: {raw_result[:200]}...")
-        return raw_result
-
+        raw_result = _ba_call(normalize_prompt(ceo_input))
+    except ValueError as e:
+        logger.warning(str(e))
+        # Fallback: Return a minimal valid structure
+        fallback = {
+            "technical_spec": f"Basic implementation for {ceo_input}",
+            "tasks": [f"Implement {ceo_input}"],
+            "dependencies": [],
+            "skills": [],
+            "resources": {"tech": [], "legal": [], "finance": [], "marketing": []}
+        }
+        raw_result = orjson.dumps(fallback).decode()
+        logger.info("Applied fallback JSON structure.")
     except Exception as e:
         logger.error(f"Failed to process CEO input '{ceo_input}': {str(e)}")
-        return None
\ No newline at end of file
+        return None
+
+    logger.info(f"BA Agent result: {raw_result[:200]}...")
+    return raw_result
\ No newline at end of file
@@ -6,7 +6,7 @@ Provides common functionality and attributes for specialized agents.
 
 from typing import Optional
 import logging
-from src.config.llm_config import llm  # Default LLM instance
+from src.config.llm_config import get_default_llm
 
 logger = logging.getLogger(__name__)
 
@@ -37,11 +37,16 @@ class BaseAgent:
         
         self.role = role
         self.goal = goal
-        self.llm = llm_instance if llm_instance is not None else llm
+        self._llm = llm_instance
         self.verbose = verbose
         
         logger.info(f"Initialized {self.__class__.__name__}: role={self.role}, goal={self.goal}, verbose={self.verbose}")
 
+    @property
+    def llm(self):
+        """LLM used by the agent; the global instance is only created when first needed."""
+        return self._llm if self._llm is not None else get_default_llm()
+
     def log_action(self, action: str, details: Optional[str] = None) -> None:
         """Log an agent action with optional details."""
         message = f"Agent '{self.role}' performed {action}"
@@ -3,47 +3,128 @@
 Employee agent module for loading employee data and evaluating task suitability.
 """
 
-import json
-from typing import List, Dict, Optional
-from crewai import Agent, Task, Crew
+import orjson
+from typing import List, Dict, NamedTuple, Optional, Tuple
+from functools import lru_cache, cache
 import logging
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from src.config.llm_config import llm
+from src.config.llm_config import get_default_llm
 from src.agents.base_agent import BaseAgent
-from src.utils.utils import call_with_retry
+from src.config import USE_CREW
+from src.utils.utils import run_crew, normalize_prompt, stream_llm, build_system_prompt
+from src.utils.cache import SemanticCache
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Evaluations are scoped per employee and reused only for the exact task wording
+_EVAL_CACHE = SemanticCache("employee_agent", exact=True)
+
+_EVAL_PROMPT_HEAD = "Can you handle this task: '"
+_EVAL_PROMPT_TAIL = "'? Reply with 'YES' or 'NO' followed by a short reason."
+_RESP_RE = re.compile(r"\b(YES|NO)\b[\s:,.-]*(.*)", re.IGNORECASE | re.DOTALL)
+_DEFAULT_REASONS = {"YES": "Task aligns with skills.", "NO": "Task outside expertise."}
+_EVAL_MAX_TOKENS = 64
+_SENTENCE_END_RE = re.compile(r"[.!?\n]")
+
+def _has_decision(text: str) -> bool:
+    """Return True if text contains a YES/NO decision, so the completion may be cached."""
+    return _RESP_RE.search(text) is not None
+
+def _decision_complete(text: str) -> bool:
+    """Return True once text holds a YES/NO decision followed by a one-sentence reason."""
+    match = _RESP_RE.search(text)
+    return bool(match) and bool(_SENTENCE_END_RE.search(match.group(2)))
+
+# Fields matching and evaluation index directly; records missing one are dropped at load time.
+# Email is optional here and checked where notifications are sent.
+_REQUIRED_FIELDS = ("name", "role")
+
+# Parsed employee files keyed on (path, mtime); editing the file invalidates the entry
+_EMP_CACHE: Dict[Tuple[str, int], List[Dict]] = {}
+
 def load_employees() -> List[Dict]:
     """
     Load employee data from the configured JSON file.
 
+    Records that are not objects with a name and role are dropped here (each
+    logged as a warning), so matching and evaluation can index them directly.
+    The parsed list is cached until the file's modification time changes.
+
     Returns:
         List of employee dictionaries.
 
     Raises:
         FileNotFoundError: If the employees file is not found.
-        json.JSONDecodeError: If the file is invalid JSON.
+        orjson.JSONDecodeError: If the file is invalid JSON.
         Exception: For other unexpected errors.
     """
     employees_file = os.getenv("EMPLOYEES_FILE", "data/employees.json")
     try:
-        with open(employees_file, "r") as f:
-            employees = json.load(f)
+        key = (employees_file, os.stat(employees_file).st_mtime_ns)
+        if key in _EMP_CACHE:
+            return _EMP_CACHE[key]
+
+        with open(employees_file, "rb") as f:
+            records = orjson.loads(f.read())
+        employees = []
+        for record in records:
+            if isinstance(record, dict) and all(k in record for k in _REQUIRED_FIELDS):
+                employees.append(record)
+            else:
+                logger.warning(f"Dropped employee record missing {_REQUIRED_FIELDS}: {record}")
+        for stale_key in [k for k in _EMP_CACHE if k[0] == employees_file]:
+            del _EMP_CACHE[stale_key]
+        _EMP_CACHE[key] = employees
         logger.info(f"Loaded {len(employees)} employees from {employees_file}")
         return employees
     except FileNotFoundError:
         logger.error(f"Employees file not found: {employees_file}")
         raise
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"Invalid JSON in {employees_file}: {e}")
         raise
     except Exception as e:
         logger.error(f"Unexpected error loading {employees_file}: {e}")
         raise
 
+class EmployeeDirectory(NamedTuple):
+    """Employee roster with lookups precomputed once per load of the employees file."""
+
+    employees: List[Dict]
+    by_name: Dict[str, Dict]
+    names: Tuple[str, ...]
+
+_DIRECTORY: Optional[EmployeeDirectory] = None
+
+def load_employee_directory() -> EmployeeDirectory:
+    """
+    Load the employee roster together with its name lookups.
+
+    The directory is rebuilt only when load_employees returns a new list, i.e.
+    when the employees file changes.
+
+    Returns:
+        EmployeeDirectory for the current employees file.
+
+    Raises:
+        Same as load_employees.
+    """
+    global _DIRECTORY
+    employees = load_employees()
+    directory = _DIRECTORY
+    if directory is None or directory.employees is not employees:
+        directory = EmployeeDirectory(
+            employees=employees,
+            by_name={e["name"]: e for e in employees},
+            names=tuple(e["name"] for e in employees),
+        )
+        _DIRECTORY = directory
+    return directory
+
 class EmployeeAgent(BaseAgent):
     """Agent to evaluate if an employee can handle a task."""
 
@@ -74,39 +155,83 @@ class EmployeeAgent(BaseAgent):
             return "NO: No task description provided."
 
         self.log_action("evaluating task", task_desc)
+        try:
+            response = _eval_call(self.name, self.role, self.goal, self.backstory, normalize_prompt(task_desc), self.verbose)
+            self.log_action("task evaluated", response)
+            return response
+        except ValueError as e:
+            logger.warning(f"Unparseable response from {self.name}: {e}")
+            return "NO: Unable to determine suitability."
+        except Exception as e:
+            logger.error(f"Error evaluating task '{task_desc}' for {self.name}: {e}")
+            return f"NO: Evaluation failed due to error."
+
+@lru_cache(maxsize=1024)
+def _eval_call(name: str, role: str, goal: str, backstory: str, task_desc_normalized: str, verbose: bool) -> str:
+    """
+    Ask the LLM whether an employee can handle a normalized task description.
+
+    Args:
+        name: Employee name, used to scope the semantic cache.
+        role: Employee role.
+        goal: Agent goal.
+        backstory: Agent backstory built from the employee's profile.
+        task_desc_normalized: Task description after normalize_prompt.
+        verbose: Enable verbose crew logging if True.
+
+    Returns:
+        String in format 'YES|NO: reason'.
+
+    Raises:
+        ValueError: If the response contains no YES/NO decision; such results are not cached.
+    """
+    cached = _EVAL_CACHE.get(task_desc_normalized, scope=name)
+    if cached is not None:
+        return cached
+
+    description = _EVAL_PROMPT_HEAD + task_desc_normalized + _EVAL_PROMPT_TAIL
+    if USE_CREW:
+        from crewai import Agent, Task, Crew
+
         agent = Agent(
-            role=self.role,
-            goal=self.goal,
-            backstory=self.backstory,
-            llm=self.llm,
-            verbose=self.verbose,
-        )
-        task = Task(
-            description=f"Can you handle this task: '{task_desc}'? Reply with 'YES' or 'NO' followed by a short reason.",
-            expected_output="YES/NO with reasoning",
-            agent=agent,
+            role=role,
+            goal=goal,
+            backstory=backstory,
+            llm=get_default_llm(),
+            verbose=verbose,
         )
+        task = Task(description=description, expected_output="YES/NO with reasoning", agent=agent)
         crew = Crew(agents=[agent], tasks=[task])
+        raw_result = run_crew(crew, _has_decision)
+    else:
+        raw_result = stream_llm(
+            build_system_prompt(role, goal, backstory), description, _EVAL_MAX_TOKENS, _decision_complete, _has_decision
+        ).strip()
 
-        try:
-            result = call_with_retry(crew)
-            raw_result = result.raw.strip()
-            self.log_action("task evaluated", raw_result)
-
-            # Parse response for consistency
-            if "YES" in raw_result.upper():
-                reason = raw_result.split("YES", 1)[1].strip(": ") if "YES" in raw_result else "Task aligns with skills."
-                return f"YES: {reason}"
-            elif "NO" in raw_result.upper():
-                reason = raw_result.split("NO", 1)[1].strip(": ") if "NO" in raw_result else "Task outside expertise."
-                return f"NO: {reason}"
-            else:
-                logger.warning(f"Unparseable response from {self.name}: {raw_result}")
-                return "NO: Unable to determine suitability."
+    # Parse response for consistency: the first standalone YES/NO is the decision
+    match = _RESP_RE.search(raw_result)
+    if not match:
+        raise ValueError(raw_result)
+    decision = match.group(1).upper()
+    reason = match.group(2).strip() or _DEFAULT_REASONS[decision]
+    response = f"{decision}: {reason}"
 
-        except Exception as e:
-            logger.error(f"Error evaluating task '{task_desc}' for {self.name}: {e}")
-            return f"NO: Evaluation failed due to error."
+    _EVAL_CACHE.set(task_desc_normalized, response, scope=name)
+    return response
+
+@cache
+def get_employee_agent(employee_key: Tuple[str, str, str, Tuple[str, ...]]) -> EmployeeAgent:
+    """
+    Return the shared EmployeeAgent for an employee profile.
+
+    Args:
+        employee_key: Tuple of (name, role, my_work, skills) identifying the profile.
+
+    Returns:
+        The EmployeeAgent built for that profile, created on first use.
+    """
+    name, role, my_work, skills = employee_key
+    return EmployeeAgent({"name": name, "role": role, "my_work": my_work, "skills": list(skills)})
 
 def create_employee_agent(employee: Dict, task_desc: str) -> str:
     """
@@ -119,5 +244,30 @@ def create_employee_agent(employee: Dict, task_desc: str) -> str:
     Returns:
         String response from the agent (YES|NO: reason).
     """
-    agent = EmployeeAgent(employee)
-    return agent.evaluate_task(task_desc)
\ No newline at end of file
+    employee_key = (employee["name"], employee["role"], employee.get("my_work", ""), tuple(employee.get("skills", [])))
+    return get_employee_agent(employee_key).evaluate_task(task_desc)
+
+def evaluate_task_batch(employees: List[Dict], task_desc: str) -> List[str]:
+    """
+    Evaluate a task for several employees concurrently.
+
+    Args:
+        employees: List of employee dictionaries.
+        task_desc: Task description to evaluate.
+
+    Returns:
+        Responses (YES|NO: reason) in the same order as employees.
+    """
+    if not employees:
+        return []
+
+    def evaluate(employee: Dict) -> str:
+        try:
+            return create_employee_agent(employee, task_desc)
+        except Exception as e:
+            logger.error(f"Error evaluating task '{task_desc}' for {employee.get('name')}: {e}")
+            return f"NO: Evaluation failed due to error: {e}"
+
+    # LLM calls are network-bound, so threads overlap their round-trips
+    with ThreadPoolExecutor(max_workers=min(len(employees), 8)) as executor:
+        return list(executor.map(evaluate, employees))
\ No newline at end of file
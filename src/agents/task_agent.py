@@ -4,15 +4,34 @@ Task Agent module for estimating task durations and generating sub-tasks.
 """
 
 from typing import Tuple, List, Dict
-from crewai import Agent, Task, Crew
+from functools import lru_cache, partial
+from copy import deepcopy
+import asyncio
 import logging
-from src.config.llm_config import llm
-from src.config.config import MAX_RETRIES
+from src.config.llm_config import get_default_llm
+from src.config.config import USE_CREW
 from src.agents.base_agent import BaseAgent
-from src.utils.utils import call_with_retry, parse_json_output, parse_duration
+from src.utils.utils import run_crew, parse_json_output, parse_duration, normalize_prompt, stream_llm, json_object_complete, build_system_prompt
+from src.utils.cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
+# Estimates depend on the exact wording, so only the same normalized task description is reused
+_TASK_CACHE = SemanticCache("task_agent", exact=True)
+
+_TASK_PROMPT_HEAD = "For '"
+_TASK_PROMPT_TAIL = (
+    "': "
+    "1. Estimate realistic duration in hours (e.g., API dev: 20-40h, UI design: 10-20h). "
+    "2. List sub-tasks as JSON: {'sub_task': str, 'help': str}. "
+    "Return a JSON object with 'duration' and 'sub_tasks'."
+)
+
+# Fallback estimates by keyword, checked in order; the first match wins
+_FALLBACK_HOURS = (("api", 30.0), ("ui", 15.0), ("database", 12.0))
+_DEFAULT_FALLBACK_HOURS = 10.0
+_TASK_MAX_TOKENS = 256
+
 class TaskAgent(BaseAgent):
     """Agent for processing tasks and estimating durations."""
 
@@ -40,63 +59,115 @@ class TaskAgent(BaseAgent):
             return 10.0, [{"sub_task": "Default task", "help": "No description provided."}]
 
         self.log_action("processing task", task)
-        agent = Agent(
-            role=self.role,
-            goal=self.goal,
-            backstory=self.backstory,
-            llm=self.llm,
-            verbose=self.verbose,
-        )
-        task_obj = Task(
-            description=(
-                f"For '{task}': "
-                "1. Estimate realistic duration in hours (e.g., API dev: 20-40h, UI design: 10-20h). "
-                "2. List sub-tasks as JSON: {'sub_task': str, 'help': str}. "
-                "Return a JSON object with 'duration' and 'sub_tasks'."
-            ),
-            expected_output="JSON with duration and sub-tasks",
-            agent=agent,
-        )
-        crew = Crew(agents=[agent], tasks=[task_obj])
-
         try:
-            result = call_with_retry(crew)
-            raw_result = result.raw.strip()
-            data = parse_json_output(raw_result)
-
-            if not data or "duration" not in data or "sub_tasks" not in data:
-                logger.warning(f"Invalid LLM output for '{task}': {raw_result[:200]}...")
-                return self._fallback(task)
-
-            duration = parse_duration(data["duration"])
-            if duration is None:
-                logger.warning(f"Unparseable duration '{data['duration']}' for '{task}'")
-                return self._fallback(task)
-
-            sub_tasks = data.get("sub_tasks", [{"sub_task": f"Sub-task 1 for {task}", "help": "Basic step"}])
-            if not isinstance(sub_tasks, list):
-                logger.warning(f"Sub-tasks not a list: {sub_tasks}")
-                sub_tasks = [{"sub_task": f"Sub-task 1 for {task}", "help": "Basic step"}]
-
-            self.log_action("task processed", f"Duration: {duration}h, Sub-tasks: {len(sub_tasks)}")
-            return duration, sub_tasks
-
+            duration, sub_tasks = _process_call(self.role, self.goal, self.backstory, normalize_prompt(task), self.verbose)
+        except ValueError as e:
+            logger.warning(f"Invalid LLM output for '{task}': {e}")
+            return self._fallback(task)
         except Exception as e:
             logger.error(f"Failed to process task '{task}': {e}")
             return self._fallback(task)
 
+        self.log_action("task processed", f"Duration: {duration}h, Sub-tasks: {len(sub_tasks)}")
+        return duration, deepcopy(sub_tasks)  # Callers may edit sub-tasks; keep the cached copy intact
+
     def _fallback(self, task: str) -> Tuple[float, List[Dict]]:
         """Provide fallback values if processing fails."""
-        duration = (
-            30.0 if "api" in task.lower() else
-            15.0 if "ui" in task.lower() else
-            12.0 if "database" in task.lower() else
-            10.0
-        )
+        task_lower = task.lower()
+        duration = next((hours for keyword, hours in _FALLBACK_HOURS if keyword in task_lower), _DEFAULT_FALLBACK_HOURS)
         sub_tasks = [{"sub_task": f"Sub-task 1 for {task}", "help": "Default step"}]
         logger.info(f"Fallback for '{task}': {duration}h, 1 sub-task")
         return duration, sub_tasks
 
+# TaskAgent holds no per-task state, so one instance serves every call
+_TASK_AGENT = TaskAgent()
+
+def _task_description(task_normalized: str) -> str:
+    """Build the estimation prompt for a normalized task description."""
+    return _TASK_PROMPT_HEAD + task_normalized + _TASK_PROMPT_TAIL
+
+def _parse_process_output(raw_result: str, task_normalized: str) -> Tuple[float, List[Dict]]:
+    """
+    Parse an LLM estimation response into a duration and sub-tasks.
+
+    Args:
+        raw_result: Raw LLM output.
+        task_normalized: Task description the output answers.
+
+    Returns:
+        Tuple of (duration in hours, list of sub-tasks).
+
+    Raises:
+        ValueError: If the output lacks a parseable duration or sub-tasks.
+    """
+    data = parse_json_output(raw_result)
+    if not data or "duration" not in data or "sub_tasks" not in data:
+        raise ValueError(f"{raw_result[:200]}...")
+
+    duration = parse_duration(data["duration"])
+    if duration is None:
+        raise ValueError(f"Unparseable duration '{data['duration']}'")
+
+    sub_tasks = data.get("sub_tasks", [{"sub_task": f"Sub-task 1 for {task_normalized}", "help": "Basic step"}])
+    if not isinstance(sub_tasks, list):
+        logger.warning(f"Sub-tasks not a list: {sub_tasks}")
+        sub_tasks = [{"sub_task": f"Sub-task 1 for {task_normalized}", "help": "Basic step"}]
+    return duration, sub_tasks
+
+def _process_output_valid(raw_result: str, task_normalized: str) -> bool:
+    """Return True if raw_result parses into a duration and sub-tasks, so it may be cached."""
+    try:
+        _parse_process_output(raw_result.strip(), task_normalized)
+    except ValueError:
+        return False
+    return True
+
+@lru_cache(maxsize=1024)
+def _process_call(role: str, goal: str, backstory: str, task_normalized: str, verbose: bool) -> Tuple[float, List[Dict]]:
+    """
+    Ask the LLM for a duration estimate and sub-tasks for a normalized task.
+
+    Args:
+        role: Agent role.
+        goal: Agent goal.
+        backstory: Agent backstory.
+        task_normalized: Task description after normalize_prompt.
+        verbose: Enable verbose crew logging if True.
+
+    Returns:
+        Tuple of (duration in hours, list of sub-tasks).
+
+    Raises:
+        ValueError: If the output lacks a parseable duration or sub-tasks; such results are not cached.
+    """
+    cached = _TASK_CACHE.get(task_normalized)
+    if cached is not None:
+        return cached["duration"], cached["sub_tasks"]
+
+    description = _task_description(task_normalized)
+    validate = partial(_process_output_valid, task_normalized=task_normalized)
+    if USE_CREW:
+        from crewai import Agent, Task, Crew
+
+        agent = Agent(
+            role=role,
+            goal=goal,
+            backstory=backstory,
+            llm=get_default_llm(),
+            verbose=verbose,
+        )
+        task_obj = Task(description=description, expected_output="JSON with duration and sub-tasks", agent=agent)
+        crew = Crew(agents=[agent], tasks=[task_obj])
+        raw_result = run_crew(crew, validate)
+    else:
+        raw_result = stream_llm(
+            build_system_prompt(role, goal, backstory), description, _TASK_MAX_TOKENS, json_object_complete, validate
+        ).strip()
+
+    duration, sub_tasks = _parse_process_output(raw_result, task_normalized)
+    _TASK_CACHE.set(task_normalized, {"duration": duration, "sub_tasks": sub_tasks})
+    return duration, sub_tasks
+
 def batch_task_processing(task: str) -> Tuple[float, List[Dict]]:
     """
     Process a task and return its duration and sub-tasks.
@@ -107,5 +178,50 @@ def batch_task_processing(task: str) -> Tuple[float, List[Dict]]:
     Returns:
         Tuple of (duration in hours, list of sub-tasks).
     """
-    agent = TaskAgent()
-    return agent.process_task(task)
\ No newline at end of file
+    return _TASK_AGENT.process_task(task)
+
+async def _process_task_async(task: str, agent: TaskAgent, semaphore: asyncio.Semaphore) -> Tuple[float, List[Dict]]:
+    """
+    Estimate one task off the event loop, bounded by the shared semaphore.
+
+    The estimate runs agent.process_task in a worker thread, so it takes the same
+    path as a single estimate: semantic and on-disk completion caches, the shared
+    rate limiter, streaming early stop, and USE_CREW. The blocking cache I/O and
+    LLM call never run on the event loop.
+
+    Args:
+        task: The task description.
+        agent: TaskAgent that performs the estimate.
+        semaphore: Caps concurrent requests to the provider.
+
+    Returns:
+        Tuple of (duration in hours, list of sub-tasks).
+    """
+    async with semaphore:
+        return await asyncio.to_thread(agent.process_task, task)
+
+async def batch_task_processing_async(tasks: List[str], max_concurrency: int = 8) -> List[Tuple[float, List[Dict]]]:
+    """
+    Estimate several tasks concurrently.
+
+    Args:
+        tasks: Task descriptions.
+        max_concurrency: Maximum number of estimates running at once.
+
+    Returns:
+        List of (duration in hours, list of sub-tasks) in the same order as tasks.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    return list(await asyncio.gather(*[_process_task_async(t, _TASK_AGENT, semaphore) for t in tasks]))
+
+def batch_task_processing_many(tasks: List[str]) -> List[Tuple[float, List[Dict]]]:
+    """
+    Synchronous wrapper around batch_task_processing_async.
+
+    Args:
+        tasks: Task descriptions.
+
+    Returns:
+        List of (duration in hours, list of sub-tasks) in the same order as tasks.
+    """
+    return asyncio.run(batch_task_processing_async(tasks))
\ No newline at end of file
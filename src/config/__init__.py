@@ -6,6 +6,8 @@ Handles general settings and LLM configuration.
 
 from .config import (
     set_page_config,
+    Settings,
+    SETTINGS,
     BASE_DELAY,
     MAX_RETRIES,
     MIN_WAIT,
@@ -13,11 +15,26 @@ from .config import (
     MAX_EMPLOYEES_PER_TASK,
     HOURS_PER_DAY,
     DEBUG,  # Added here
+    MAX_HISTORY,
+    USE_CREW,
+    CACHE_DIR,
+    LLM_CACHE_DIR,
+    LLM_CACHE_TTL,
+    SEMANTIC_CACHE_THRESHOLD,
+    LLM_RATE_LIMIT,
 )
-from .llm_config import llm
+from .llm_config import get_default_llm, LLMSettings
+
+def __getattr__(name):
+    """Resolve `llm` lazily so importing config does not load crewai (PEP 562)."""
+    if name == "llm":
+        return get_default_llm()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     "set_page_config",
+    "Settings",
+    "SETTINGS",
     "BASE_DELAY",
     "MAX_RETRIES",
     "MIN_WAIT",
@@ -25,5 +42,14 @@ __all__ = [
     "MAX_EMPLOYEES_PER_TASK",
     "HOURS_PER_DAY",
     "DEBUG",  # Added here
+    "MAX_HISTORY",
+    "USE_CREW",
+    "CACHE_DIR",
+    "LLM_CACHE_DIR",
+    "LLM_CACHE_TTL",
+    "SEMANTIC_CACHE_THRESHOLD",
+    "LLM_RATE_LIMIT",
     "llm",
+    "get_default_llm",
+    "LLMSettings",
 ]
\ No newline at end of file
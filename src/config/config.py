@@ -5,22 +5,77 @@ Defines constants and Streamlit page setup.
 """
 
 import os
+from dataclasses import dataclass
 from typing import Optional
 from dotenv import load_dotenv
-import streamlit as st
 import logging
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Application settings, parsed from the environment once at import."""
+
+    base_delay: float               # Delay between retries (seconds)
+    max_retries: int                # Max retry attempts for LLM calls
+    min_wait: float                 # Min wait time for retries (seconds)
+    max_wait: float                 # Max wait time for retries (seconds)
+    max_employees_per_task: int     # Max employees per task
+    hours_per_day: int              # Hours in a workday
+    debug: bool                     # Debug mode toggle
+    max_history: int                # Max undo/redo snapshots kept per session
+    use_crew: bool                  # Route single-prompt agents through crewai.Crew
+    cache_dir: str                  # LLM response cache directory
+    llm_cache_dir: str              # On-disk LLM completion cache
+    llm_cache_ttl: int              # Completion cache entry lifetime (seconds)
+    semantic_cache_threshold: float # Min similarity for a cache hit
+    llm_rate_limit: float           # Max LLM requests started per second
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """
+        Build settings from environment variables, applying defaults for unset ones.
+
+        Returns:
+            Populated Settings instance.
+        """
+        env = os.environ
+        cache_dir = env.get("CACHE_DIR", "cache_data")
+        return cls(
+            base_delay=float(env.get("BASE_DELAY", 0.01)),
+            max_retries=int(env.get("MAX_RETRIES", 10)),
+            min_wait=float(env.get("MIN_WAIT", 0.083)),
+            max_wait=float(env.get("MAX_WAIT", 60)),
+            max_employees_per_task=int(env.get("MAX_EMPLOYEES_PER_TASK", 4)),
+            hours_per_day=int(env.get("HOURS_PER_DAY", 8)),
+            debug=env.get("DEBUG", "True").lower() == "true",
+            max_history=int(env.get("MAX_HISTORY", 20)),
+            use_crew=env.get("USE_CREW", "False").lower() == "true",
+            cache_dir=cache_dir,
+            llm_cache_dir=env.get("LLM_CACHE_DIR", os.path.join(cache_dir, "llm")),
+            llm_cache_ttl=int(env.get("LLM_CACHE_TTL", 7 * 86400)),
+            semantic_cache_threshold=float(env.get("SEMANTIC_CACHE_THRESHOLD", 0.92)),
+            llm_rate_limit=float(env.get("LLM_RATE_LIMIT", 10)),
+        )
+
+SETTINGS = Settings.from_env()
+
 # Constants with defaults, overridable via .env
-BASE_DELAY: float = float(os.getenv("BASE_DELAY", 0.01))  # Delay between retries (seconds)
-MAX_RETRIES: int = int(os.getenv("MAX_RETRIES", 10))       # Max retry attempts for LLM calls
-MIN_WAIT: float = float(os.getenv("MIN_WAIT", 0.083))      # Min wait time for retries (seconds)
-MAX_WAIT: float = float(os.getenv("MAX_WAIT", 60))         # Max wait time for retries (seconds)
-MAX_EMPLOYEES_PER_TASK: int = int(os.getenv("MAX_EMPLOYEES_PER_TASK", 4))  # Max employees per task
-HOURS_PER_DAY: int = int(os.getenv("HOURS_PER_DAY", 8))    # Hours in a workday
-DEBUG: bool = os.getenv("DEBUG", "True").lower() == "true" # Debug mode toggle
+BASE_DELAY: float = SETTINGS.base_delay
+MAX_RETRIES: int = SETTINGS.max_retries
+MIN_WAIT: float = SETTINGS.min_wait
+MAX_WAIT: float = SETTINGS.max_wait
+MAX_EMPLOYEES_PER_TASK: int = SETTINGS.max_employees_per_task
+HOURS_PER_DAY: int = SETTINGS.hours_per_day
+DEBUG: bool = SETTINGS.debug
+MAX_HISTORY: int = SETTINGS.max_history
+USE_CREW: bool = SETTINGS.use_crew
+CACHE_DIR: str = SETTINGS.cache_dir
+LLM_CACHE_DIR: str = SETTINGS.llm_cache_dir
+LLM_CACHE_TTL: int = SETTINGS.llm_cache_ttl
+SEMANTIC_CACHE_THRESHOLD: float = SETTINGS.semantic_cache_threshold
+LLM_RATE_LIMIT: float = SETTINGS.llm_rate_limit
 
 def set_page_config(title: Optional[str] = None) -> None:
     """
@@ -29,6 +84,8 @@ def set_page_config(title: Optional[str] = None) -> None:
     Args:
         title: Optional custom page title; defaults to .env or "Startup Crew AI Manager".
     """
+    import streamlit as st  # Imported here so non-UI entrypoints skip loading Streamlit
+
     default_title = os.getenv("PAGE_TITLE", "Startup Crew AI Manager")
     page_title = title if title is not None else default_title
     
@@ -43,18 +100,27 @@ def set_page_config(title: Optional[str] = None) -> None:
         logger.error(f"Failed to set page config: {e}")
         st.set_page_config(page_title="Task Manager (Error)", layout="wide")  # Fallback
 
-# Validate and log constants
-try:
-    assert BASE_DELAY >= 0, "BASE_DELAY must be non-negative"
-    assert MAX_RETRIES > 0, "MAX_RETRIES must be positive"
-    assert MIN_WAIT > 0, "MIN_WAIT must be positive"
-    assert MAX_WAIT >= MIN_WAIT, "MAX_WAIT must be >= MIN_WAIT"
-    assert MAX_EMPLOYEES_PER_TASK > 0, "MAX_EMPLOYEES_PER_TASK must be positive"
-    assert HOURS_PER_DAY > 0, "HOURS_PER_DAY must be positive"
-    logger.debug(f"Config loaded: BASE_DELAY={BASE_DELAY}, MAX_RETRIES={MAX_RETRIES}, "
-                 f"MIN_WAIT={MIN_WAIT}, MAX_WAIT={MAX_WAIT}, "
-                 f"MAX_EMPLOYEES_PER_TASK={MAX_EMPLOYEES_PER_TASK}, HOURS_PER_DAY={HOURS_PER_DAY}, "
-                 f"DEBUG={DEBUG}")
-except AssertionError as e:
-    logger.error(f"Invalid configuration: {e}")
-    raise
\ No newline at end of file
+# Validate and log constants; explicit checks still run under `python -O`
+_CHECKS = (
+    ("BASE_DELAY", BASE_DELAY, lambda x: x >= 0, "must be non-negative"),
+    ("MAX_RETRIES", MAX_RETRIES, lambda x: x > 0, "must be positive"),
+    ("MIN_WAIT", MIN_WAIT, lambda x: x > 0, "must be positive"),
+    ("MAX_WAIT", MAX_WAIT, lambda x: x >= MIN_WAIT, "must be >= MIN_WAIT"),
+    ("MAX_EMPLOYEES_PER_TASK", MAX_EMPLOYEES_PER_TASK, lambda x: x > 0, "must be positive"),
+    ("HOURS_PER_DAY", HOURS_PER_DAY, lambda x: x > 0, "must be positive"),
+    ("MAX_HISTORY", MAX_HISTORY, lambda x: x > 0, "must be positive"),
+    ("LLM_CACHE_TTL", LLM_CACHE_TTL, lambda x: x > 0, "must be positive"),
+    ("SEMANTIC_CACHE_THRESHOLD", SEMANTIC_CACHE_THRESHOLD, lambda x: 0 < x <= 1, "must be in (0, 1]"),
+    ("LLM_RATE_LIMIT", LLM_RATE_LIMIT, lambda x: x > 0, "must be positive"),
+)
+for _name, _value, _is_valid, _rule in _CHECKS:
+    if not _is_valid(_value):
+        logger.error(f"Invalid configuration: {_name}={_value} {_rule}")
+        raise ValueError(f"{_name}={_value} {_rule}")
+
+logger.debug(f"Config loaded: BASE_DELAY={BASE_DELAY}, MAX_RETRIES={MAX_RETRIES}, "
+             f"MIN_WAIT={MIN_WAIT}, MAX_WAIT={MAX_WAIT}, "
+             f"MAX_EMPLOYEES_PER_TASK={MAX_EMPLOYEES_PER_TASK}, HOURS_PER_DAY={HOURS_PER_DAY}, "
+             f"DEBUG={DEBUG}, MAX_HISTORY={MAX_HISTORY}, USE_CREW={USE_CREW}, CACHE_DIR={CACHE_DIR}, "
+             f"LLM_CACHE_DIR={LLM_CACHE_DIR}, LLM_CACHE_TTL={LLM_CACHE_TTL}, SEMANTIC_CACHE_THRESHOLD={SEMANTIC_CACHE_THRESHOLD}, "
+             f"LLM_RATE_LIMIT={LLM_RATE_LIMIT}")
\ No newline at end of file
@@ -2,18 +2,50 @@
 """
 LLM configuration for the Task Manager application.
 Sets up the language model instance used by AI agents.
+The global `llm` is created on first access so importing config does not load crewai.
 """
 
 import os
-from typing import Optional
+import threading
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, TYPE_CHECKING
 from dotenv import load_dotenv
-from crewai import LLM
 import logging
 
+if TYPE_CHECKING:
+    from crewai import LLM
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
-def get_llm() -> LLM:
+@dataclass(frozen=True, slots=True)
+class LLMSettings:
+    """LLM connection and sampling settings, parsed from the environment in one pass."""
+
+    api_key: Optional[str]
+    model_name: str
+    temperature: float
+    max_tokens: int
+    base_url: str
+
+    @classmethod
+    def from_env(cls) -> "LLMSettings":
+        """
+        Build LLM settings from environment variables, applying defaults for unset ones.
+
+        Returns:
+            Populated LLMSettings instance.
+        """
+        env = os.environ
+        return cls(
+            api_key=env.get("LLM_API_KEY"),
+            model_name=env.get("LLM_MODEL_NAME", "groq/llama-3.1-8b-instant"),
+            temperature=float(env.get("LLM_TEMPERATURE", 0.7)),
+            max_tokens=int(env.get("LLM_MAX_TOKENS", 512)),
+            base_url=env.get("LLM_BASE_URL", "https://api.groq.com/openai/v1"),
+        )
+
+def get_llm() -> "LLM":
     """
     Create and return an LLM instance based on environment variables.
 
@@ -24,11 +56,12 @@ def get_llm() -> LLM:
         ValueError: If required LLM parameters are missing or invalid.
     """
     # Load LLM settings from .env with defaults
-    api_key: Optional[str] = os.getenv("LLM_API_KEY")
-    model_name: str = os.getenv("LLM_MODEL_NAME", "groq/llama-3.1-8b-instant")
-    temperature: float = float(os.getenv("LLM_TEMPERATURE", 0.7))
-    max_tokens: int = int(os.getenv("LLM_MAX_TOKENS", 512))
-    base_url: str = os.getenv("LLM_BASE_URL", "https://api.groq.com/openai/v1")
+    settings = LLMSettings.from_env()
+    api_key = settings.api_key
+    model_name = settings.model_name
+    temperature = settings.temperature
+    max_tokens = settings.max_tokens
+    base_url = settings.base_url
 
     # Validate critical parameters
     if not api_key:
@@ -44,6 +77,8 @@ def get_llm() -> LLM:
         logger.warning(f"LLM_MAX_TOKENS={max_tokens} must be positive, defaulting to 512")
         max_tokens = 512
 
+    from crewai import LLM
+
     try:
         llm_instance = LLM(
             model=model_name,
@@ -59,5 +94,65 @@ def get_llm() -> LLM:
         logger.error(f"Failed to initialize LLM: {e}")
         raise
 
-# Global LLM instance
-llm = get_llm()
\ No newline at end of file
+def get_completion_kwargs(llm_instance: Optional["LLM"] = None) -> Dict[str, Any]:
+    """
+    Build keyword arguments for calling LiteLLM directly with the configured model.
+
+    Args:
+        llm_instance: Optional LLM instance; defaults to the global llm.
+
+    Returns:
+        Dictionary of model, sampling, and endpoint settings for litellm.completion/acompletion.
+    """
+    instance = llm_instance if llm_instance is not None else get_default_llm()
+    return {
+        "model": instance.model,
+        "temperature": instance.temperature,
+        "max_tokens": instance.max_tokens,
+        "api_base": instance.base_url,
+        "api_key": instance.api_key,
+    }
+
+def configure_http_clients() -> None:
+    """
+    Install a shared, keep-alive HTTP/2 client for LiteLLM's synchronous calls.
+
+    Reusing one connection pool avoids a fresh TCP/TLS handshake on every LLM call.
+    No shared async client is installed: an httpx.AsyncClient's pool is bound to
+    the event loop that created it, and batch estimates run in a fresh asyncio.run
+    loop per call, on several threads at once.
+    """
+    import httpx
+    import litellm
+
+    limits = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+    litellm.client_session = httpx.Client(http2=True, timeout=60, limits=limits)
+    logger.info("Configured pooled HTTP/2 client for LiteLLM")
+
+_llm_instance: Optional["LLM"] = None
+_llm_lock = threading.Lock()
+
+def get_default_llm() -> "LLM":
+    """
+    Return the shared LLM instance, creating it and the HTTP client on first use.
+
+    Returns:
+        Configured LLM instance.
+
+    Raises:
+        ValueError: If required LLM parameters are missing or invalid.
+    """
+    global _llm_instance
+    if _llm_instance is None:
+        with _llm_lock:
+            if _llm_instance is None:
+                instance = get_llm()
+                configure_http_clients()
+                _llm_instance = instance
+    return _llm_instance
+
+def __getattr__(name: str) -> Any:
+    """Resolve the global `llm` lazily (PEP 562)."""
+    if name == "llm":
+        return get_default_llm()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -12,7 +12,13 @@ from .navigation import (
     create_progress_bar,
     render_navigation_sidebar,
 )
-from .state_management import initialize_session_state, save_persistent_state
+from .state_management import (
+    initialize_session_state,
+    save_persistent_state,
+    flush_persistent_state,
+    mark_dirty,
+    rebuild_task_board_index,
+)
 from .task_processing import (
     check_employees_for_task,
     assign_subtasks_to_employees,
@@ -35,6 +41,9 @@ __all__ = [
     "render_navigation_sidebar",
     "initialize_session_state",
     "save_persistent_state",
+    "flush_persistent_state",
+    "mark_dirty",
+    "rebuild_task_board_index",
     "check_employees_for_task",
     "assign_subtasks_to_employees",
     "render_step_1_ceo_input",
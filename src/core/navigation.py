@@ -5,9 +5,12 @@ Handles step progression, undo/redo, and UI navigation elements.
 """
 
 import streamlit as st
-from src.core.state_management import save_persistent_state
+from src.core.state_management import save_persistent_state, mark_dirty, rebuild_task_board_index
+from src.config import MAX_HISTORY
 from copy import deepcopy
+from typing import Any, Dict, List
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +28,7 @@ def go_to_next_step() -> None:
     """Move to the next step and save history."""
     save_state_to_history()
     st.session_state.current_step = min(st.session_state.current_step + 1, len(STEPS))
+    mark_dirty("current_step")
     save_persistent_state()
     logger.debug(f"Navigated to step {st.session_state.current_step}")
 
@@ -33,6 +37,7 @@ def go_to_previous_step() -> None:
     if st.session_state.get("current_step", 1) > 1:
         save_state_to_history()
         st.session_state.current_step -= 1
+        mark_dirty("current_step")
         save_persistent_state()
         logger.debug(f"Navigated to step {st.session_state.current_step}")
 
@@ -41,19 +46,45 @@ def reset_to_step(step: int) -> None:
     if 1 <= step <= len(STEPS):
         save_state_to_history()
         st.session_state.current_step = step
+        mark_dirty("current_step")
         save_persistent_state()
         logger.debug(f"Reset to step {step}")
     else:
         logger.warning(f"Invalid step reset attempted: {step}")
 
+def _snapshot(value: Any) -> Any:
+    """
+    Deep-copy JSON-shaped session data for history.
+
+    An orjson round-trip is much faster than deepcopy for nested dicts/lists;
+    values orjson cannot encode fall back to deepcopy.
+    """
+    try:
+        return orjson.loads(orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY))
+    except TypeError:
+        return deepcopy(value)
+
+def _materialize(history: List[Dict[str, Any]], index: int) -> Dict[str, Any]:
+    """Rebuild the full state at history[index] by replaying the deltas up to it."""
+    state: Dict[str, Any] = {}
+    for delta in history[:index + 1]:
+        state.update(delta)
+    return state
+
 def save_state_to_history() -> None:
-    """Save the current session state to history."""
+    """
+    Save the current session state to history.
+
+    Each entry holds only the top-level keys that changed since the previous
+    entry; the first entry is a full snapshot. When the cap is exceeded, the
+    oldest entries are folded into the new first entry.
+    """
     try:
         state = {
             "current_step": st.session_state.get("current_step", 1),
-            "output": deepcopy(st.session_state.get("output")),
-            "task_board": deepcopy(st.session_state.get("task_board", [])),
-            "sub_tasks": deepcopy(st.session_state.get("sub_tasks", {})),
+            "output": _snapshot(st.session_state.get("output")),
+            "task_board": _snapshot(st.session_state.get("task_board", [])),
+            "sub_tasks": _snapshot(st.session_state.get("sub_tasks", {})),
             "ceo_input": st.session_state.get("ceo_input", ""),
             "scrum_master_approval": st.session_state.get("scrum_master_approval", False),
         }
@@ -62,10 +93,22 @@ def save_state_to_history() -> None:
 
         # Truncate future history if inserting in the middle
         if history_index < len(history) - 1:
-            st.session_state.history = history[:history_index + 1]
-        st.session_state.history.append(state)
-        st.session_state.history_index = history_index + 1
-        logger.debug(f"Saved state to history at index {st.session_state.history_index}")
+            history = history[:history_index + 1]
+        head = st.session_state.get("_history_head")
+        if head is None:
+            head = _materialize(history, len(history) - 1)
+        delta = {key: value for key, value in state.items() if key not in head or head[key] != value}
+        history.append(delta)
+        head.update(delta)
+        # Fold the oldest deltas into a full first entry beyond the cap
+        if len(history) > MAX_HISTORY:
+            excess = len(history) - MAX_HISTORY
+            history[:excess + 1] = [_materialize(history, excess)]
+        st.session_state.history = history
+        st.session_state.history_index = len(history) - 1
+        st.session_state._history_head = head
+        mark_dirty("history", "history_index")
+        logger.debug(f"Saved state to history at index {st.session_state.history_index} (changed: {sorted(delta)})")
     except Exception as e:
         logger.error(f"Failed to save state to history: {e}")
 
@@ -92,9 +135,13 @@ def restore_state() -> None:
         history = st.session_state.get("history", [])
         history_index = st.session_state.get("history_index", -1)
         if 0 <= history_index < len(history):
-            state = history[history_index]
+            state = _materialize(history, history_index)
+            st.session_state._history_head = state
             for key, value in state.items():
-                st.session_state[key] = value
+                # Copy so later in-place edits cannot rewrite history entries
+                st.session_state[key] = _snapshot(value)
+            rebuild_task_board_index()
+            mark_dirty("history_index", *state)
             save_persistent_state()
             logger.debug(f"Restored state from history index {history_index}")
     except Exception as e:
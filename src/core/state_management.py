@@ -5,10 +5,15 @@ Handles initialization, persistence, and session ID generation.
 """
 
 import streamlit as st
-import json
+import orjson
 import os
 import uuid
+import atexit
+import queue
+import tempfile
+import threading
 import logging
+from copy import deepcopy
 from typing import Optional, Dict, Any
 from dotenv import load_dotenv
 
@@ -19,15 +24,26 @@ def get_session_id() -> str:
     """
     Get or generate a unique session ID from query parameters.
 
+    The ID is resolved from the query parameters once and then read from
+    st.session_state._sid.
+
     Returns:
         Session ID as a string.
     """
+    session_id = st.session_state.get("_sid")
+    if session_id is not None:
+        return session_id
     query_params = st.query_params
     if "session_id" not in query_params:
         session_id = str(uuid.uuid4())
         st.query_params["session_id"] = session_id
         logger.debug(f"Generated new session ID: {session_id}")
-    return query_params["session_id"]
+    session_id = query_params["session_id"]
+    st.session_state._sid = session_id
+    return session_id
+
+# Session ID -> storage file path; the session directory is created on first use
+_storage_path_cache: Dict[str, str] = {}
 
 def get_storage_path() -> str:
     """
@@ -36,71 +52,189 @@ def get_storage_path() -> str:
     Returns:
         File path as a string.
     """
-    session_dir = os.getenv("SESSION_DIR", "session_data")
-    os.makedirs(session_dir, exist_ok=True)
     session_id = get_session_id()
-    path = os.path.join(session_dir, f"session_{session_id}.json")
+    path = _storage_path_cache.get(session_id)
+    if path is None:
+        session_dir = os.getenv("SESSION_DIR", "session_data")
+        os.makedirs(session_dir, exist_ok=True)
+        path = os.path.join(session_dir, f"session_{session_id}.json")
+        _storage_path_cache[session_id] = path
     return path
 
 def load_persistent_state() -> Optional[Dict[str, Any]]:
     """
     Load persistent state from disk.
 
+    Saves still queued in the debounced writer are flushed first, so a reload
+    within the debounce window reads the latest state.
+
     Returns:
         Dictionary of session state if loaded, None otherwise.
     """
     file_path = get_storage_path()
+    flush_persistent_state()
     try:
         if os.path.exists(file_path):
-            with open(file_path, "r") as f:
-                data = json.load(f)
+            with open(file_path, "rb") as f:
+                data = orjson.loads(f.read())
             logger.info(f"Loaded persistent state for session {get_session_id()} from {file_path}")
             return data
         logger.debug(f"No persistent state found at {file_path}")
         return None
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"Invalid JSON in {file_path}: {e}")
         return None
     except Exception as e:
         logger.error(f"Failed to load state from {file_path}: {e}")
         return None
 
+# Persisted session keys and their defaults, in file order
+_PERSISTED_DEFAULTS: Dict[str, Any] = {
+    "current_step": 1,
+    "output": None,
+    "task_board": [],
+    "sub_tasks": {},
+    "ceo_input": "",
+    "scrum_master_approval": False,
+    "history": [],
+    "history_index": -1,
+    "assignment_responses": {},
+}
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+# Keys written only by navigation code that always flags them; every other key is
+# re-encoded on each save, so an in-place edit that missed mark_dirty is still saved
+_MARKED_ONLY_KEYS = frozenset({"history", "history_index"})
+
+# Debounced writer: saves are queued and coalesced so the UI thread never touches the disk
+_WRITE_DEBOUNCE = 0.5  # Seconds to collect further saves before writing
+_persist_queue: "queue.Queue[tuple]" = queue.Queue()
+_persist_wake = threading.Event()
+_persist_shutdown = threading.Event()
+_persist_lock = threading.Lock()
+
+def _write_atomic(file_path: str, payload: bytes) -> None:
+    """
+    Write payload to file_path via a temporary file and rename, so readers never see a partial file.
+
+    The payload is written in one buffered call and fsynced before the rename,
+    so a crash leaves either the old file or the complete new one.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb", buffering=65536) as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def flush_persistent_state() -> None:
+    """Write every queued save now, keeping only the latest payload per file."""
+    with _persist_lock:
+        latest: Dict[str, bytes] = {}
+        while True:
+            try:
+                file_path, payload = _persist_queue.get_nowait()
+            except queue.Empty:
+                break
+            latest[file_path] = payload
+        for file_path, payload in latest.items():
+            try:
+                _write_atomic(file_path, payload)
+                logger.debug(f"Saved state to {file_path}")
+            except Exception as e:
+                logger.error(f"Failed to save state to {file_path}: {e}")
+
+def _persist_worker() -> None:
+    """Background loop: wait for a save, let more arrive for _WRITE_DEBOUNCE seconds, then flush."""
+    while not _persist_shutdown.is_set():
+        _persist_wake.wait()
+        _persist_shutdown.wait(_WRITE_DEBOUNCE)
+        _persist_wake.clear()
+        flush_persistent_state()
+
+threading.Thread(target=_persist_worker, name="state-writer", daemon=True).start()
+
+def _shutdown_writer() -> None:
+    """Stop the writer and drain pending saves at interpreter exit."""
+    _persist_shutdown.set()
+    _persist_wake.set()
+    flush_persistent_state()
+
+atexit.register(_shutdown_writer)
+
+def mark_dirty(*keys: str) -> None:
+    """
+    Flag persisted session keys as changed since the last save.
+
+    Args:
+        keys: Names of the changed keys; flags every persisted key if none are given.
+    """
+    dirty = st.session_state.setdefault("_dirty_keys", set())
+    dirty.update(keys or _PERSISTED_DEFAULTS)
+    # Bumped on every change so derived data (e.g. the exported plan) knows when to rebuild
+    st.session_state._state_revision = st.session_state.get("_state_revision", 0) + 1
+
 def save_persistent_state() -> None:
-    """Save the current session state to disk."""
+    """
+    Save the current session state to disk.
+
+    A save runs once any key is flagged with mark_dirty. The large history keys
+    are re-serialized only when flagged; the other keys are re-encoded and
+    compared with their last saved bytes, so in-place edits are never lost.
+    Does nothing if no key is dirty or every key encodes to the bytes already saved.
+    The file itself is written by the background writer, which coalesces saves
+    arriving within _WRITE_DEBOUNCE seconds.
+    """
+    dirty = st.session_state.get("_dirty_keys")
+    if not dirty:
+        return
+
     file_path = get_storage_path()
     try:
-        state_to_save = {
-            "current_step": st.session_state.get("current_step", 1),
-            "output": st.session_state.get("output"),
-            "task_board": st.session_state.get("task_board", []),
-            "sub_tasks": st.session_state.get("sub_tasks", {}),
-            "ceo_input": st.session_state.get("ceo_input", ""),
-            "scrum_master_approval": st.session_state.get("scrum_master_approval", False),
-            "history": st.session_state.get("history", []),
-            "history_index": st.session_state.get("history_index", -1),
-            "assignment_responses": st.session_state.get("assignment_responses", {}),
-        }
-        with open(file_path, "w") as f:
-            json.dump(state_to_save, f, default=str, indent=2)
-        logger.debug(f"Saved state for session {get_session_id()} to {file_path}")
+        fragments = st.session_state.setdefault("_state_fragments", {})
+        changed = []
+        for key, default in _PERSISTED_DEFAULTS.items():
+            if key in dirty or key not in fragments or key not in _MARKED_ONLY_KEYS:
+                fragment = orjson.dumps(st.session_state.get(key, default), default=str, option=_ORJSON_OPTIONS)
+                if fragments.get(key) != fragment:
+                    fragments[key] = fragment
+                    changed.append(key)
+        if not changed:
+            # Every key re-encoded to the bytes already on disk; skip the write
+            dirty.clear()
+            return
+        payload = b"{" + b",".join(b'"%s":%s' % (key.encode(), fragments[key]) for key in _PERSISTED_DEFAULTS) + b"}\n"
+        _persist_queue.put((file_path, payload))
+        _persist_wake.set()
+        logger.debug(f"Queued state for session {get_session_id()} (changed: {changed})")
+        dirty.clear()
     except Exception as e:
         logger.error(f"Failed to save state to {file_path}: {e}")
 
+def rebuild_task_board_index() -> Dict[str, int]:
+    """
+    Rebuild the task name -> task_board position map from the current task board.
+
+    Returns:
+        The rebuilt index, also stored as st.session_state.task_board_index.
+    """
+    index = {entry["task"]: i for i, entry in enumerate(st.session_state.get("task_board", []))}
+    st.session_state.task_board_index = index
+    return index
+
+def get_task_board_index() -> Dict[str, int]:
+    """Return the task name -> task_board position map, building it if missing."""
+    index = st.session_state.get("task_board_index")
+    return index if index is not None else rebuild_task_board_index()
+
 def initialize_session_state() -> None:
     """Initialize or restore the session state."""
     if "initialized" not in st.session_state:
         persistent_state = load_persistent_state()
-        defaults = {
-            "current_step": 1,
-            "output": None,
-            "task_board": [],
-            "sub_tasks": {},
-            "ceo_input": "",
-            "scrum_master_approval": False,
-            "history": [],
-            "history_index": -1,
-            "assignment_responses": {},
-        }
+        defaults = deepcopy(_PERSISTED_DEFAULTS)
         
         try:
             if persistent_state:
@@ -112,9 +246,11 @@ def initialize_session_state() -> None:
                 st.session_state.update(defaults)
                 st.info("Starting a new project. Progress will be auto-saved.", icon="ℹ️")
                 logger.info(f"Initialized new session {get_session_id()}")
+            rebuild_task_board_index()
             st.session_state.initialized = True
         except Exception as e:
             logger.error(f"Failed to initialize session state: {e}")
             st.session_state.update(defaults)  # Fallback to defaults
+            rebuild_task_board_index()
             st.warning("Failed to load session, starting fresh.", icon="⚠️")
             st.session_state.initialized = True
\ No newline at end of file
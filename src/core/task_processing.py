@@ -4,18 +4,17 @@ Task processing utilities for the Task Manager application.
 Handles employee assignment and sub-task distribution.
 """
 
-import time
 import logging
-from typing import List, Dict, Tuple, Any
-from src.config import BASE_DELAY
-from src.agents.employee_agent import create_employee_agent
+import numpy as np
+from typing import List, Dict, Tuple, Any, Union
+from src.agents.employee_agent import EmployeeDirectory, evaluate_task_batch
 from src.utils.utils import parse_duration  # Moved here
 
 logger = logging.getLogger(__name__)
 
 def check_employees_for_task(
     task: str,
-    employees: List[Dict[str, Any]],
+    employees: Union[EmployeeDirectory, List[Dict[str, Any]]],
     scored_employees: List[Tuple[Dict[str, Any], float]],
     required_employees: int
 ) -> Tuple[List[Dict[str, Any]], List[str]]:
@@ -24,30 +23,40 @@ def check_employees_for_task(
 
     Args:
         task: Task description.
-        employees: List of all employee dictionaries.
-        scored_employees: List of (employee, score) tuples from task_matcher.
+        employees: EmployeeDirectory or list of all employee dictionaries.
+        scored_employees: List of (employee, score) tuples from task_matcher; employees
+            scoring 0 are pruned before any LLM evaluation.
         required_employees: Number of employees needed.
 
     Returns:
         Tuple of (assigned employees, response messages).
     """
+    if isinstance(employees, EmployeeDirectory):
+        employees = employees.employees
     if not task.strip() or not employees or required_employees <= 0:
         logger.warning(f"Invalid inputs: task='{task}', employees={len(employees)}, required={required_employees}")
         return [], ["No assignment possible due to invalid inputs."]
 
-    # Map scores to employees, defaulting to 0 if not found
-    employee_scores = {emp["name"]: 0.0 for emp in employees}
-    for emp, score in scored_employees:
-        employee_scores[emp["name"]] = score
-
-    # Sort employees by score
-    sorted_employees = sorted(employees, key=lambda e: employee_scores.get(e["name"], 0), reverse=True)
+    # Select the top scorers with an O(N) partial partition instead of sorting every employee
+    employee_scores = {emp["name"]: score for emp, score in scored_employees}
+    scores = np.fromiter(
+        (employee_scores.get(e["name"], 0.0) for e in employees), dtype=np.float32, count=len(employees)
+    )
+    k = min(required_employees, len(employees))
+    top_idx = np.argpartition(-scores, k - 1)[:k]
+    top_idx = top_idx[np.argsort(-scores[top_idx], kind="stable")]
     assigned, responses = [], []
 
-    for emp in sorted_employees[:required_employees]:
+    # Employees with no skill overlap (score 0) would only decline; skip their LLM calls
+    candidates = [employees[i] for i in top_idx if scores[i] > 0]
+    if not candidates:
+        logger.warning(f"No employees with matching skills for '{task}'")
+        return [], ["⚠️ No employees have skills matching this task."]
+
+    replies = evaluate_task_batch(candidates, task)
+
+    for emp, reply in zip(candidates, replies):
         try:
-            time.sleep(BASE_DELAY)  # Rate limiting
-            reply = create_employee_agent(emp, task)
             accepted = "YES" in reply.split(":")[0].upper()
             score = employee_scores.get(emp["name"], 0)
             reason = reply.split(":", 1)[1].strip() if ":" in reply else "No reason provided."
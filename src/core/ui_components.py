@@ -5,23 +5,181 @@ Renders the six-step workflow in Streamlit.
 """
 
 import streamlit as st
-import pandas as pd
-import json
+import io
+import orjson
 from datetime import datetime, timedelta
 import logging
-from typing import Dict, List, Any
-from src.agents import run_ba_agent, load_employees, batch_task_processing
-from src.services.task_matcher import get_similarity_scores
-from src.core.task_processing import check_employees_for_task, assign_subtasks_to_employees
-from src.utils.utils import parse_json_output
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Optional, TYPE_CHECKING
 from src.core.navigation import go_to_next_step, go_to_previous_step, reset_to_step, save_state_to_history
-from src.config import HOURS_PER_DAY, MAX_EMPLOYEES_PER_TASK, DEBUG
+from src.core.state_management import mark_dirty, get_task_board_index
+from src.config import MAX_EMPLOYEES_PER_TASK, DEBUG
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# pandas, the agents (LLM clients), the matcher (scikit-learn), and utils (LiteLLM) are
+# imported inside the steps that use them, so a cold start showing step 1 skips them
 
 logger = logging.getLogger(__name__)
 
 # Constants
 STEPS = ["CEO Input", "Technical Spec", "Task Planning", "Task Assignment", "Sub-tasks", "Project Report"]
 
+# Speculative LLM work started before the user asks for it; results land in the agent caches
+_PREFETCH_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch")
+
+# Widget callbacks: Streamlit runs these once per committed edit, before the rerun,
+# so history and persistence see one event per edit rather than one per rerun
+
+def _on_ceo_input_change() -> None:
+    """Commit an edited CEO input to state and history, then prefetch its analysis."""
+    ceo_input = st.session_state.get("ceo_input_text", "")
+    if ceo_input != st.session_state.get("ceo_input"):
+        st.session_state.ceo_input = ceo_input
+        mark_dirty("ceo_input")
+        save_state_to_history()
+    _prefetch_ba_analysis()
+
+def _on_tech_spec_change() -> None:
+    """Commit an edited technical specification to state and history."""
+    output = st.session_state.get("output")
+    if output is not None:
+        output["technical_spec"] = st.session_state.get("tech_spec_text", "")
+        mark_dirty("output")
+        save_state_to_history()
+        st.session_state._tech_spec_updated = True
+
+def _flag_edit(editor_key: str) -> None:
+    """on_change callback for data editors: note that the editor's rows changed."""
+    st.session_state.setdefault("_pending_edits", set()).add(editor_key)
+
+def _take_edit(editor_key: str) -> bool:
+    """Return True once for each edit flagged by _flag_edit on editor_key."""
+    pending = st.session_state.get("_pending_edits")
+    if pending and editor_key in pending:
+        pending.discard(editor_key)
+        return True
+    return False
+
+def _prefetch_ba_analysis() -> None:
+    """Start the BA analysis as soon as the CEO input changes so it is ready when Analyze is clicked."""
+    ceo_input = st.session_state.get("ceo_input_text", "")
+    if ceo_input.strip():
+        from src.agents import run_ba_agent
+
+        st.session_state["_ba_prefetch"] = (ceo_input, _PREFETCH_POOL.submit(run_ba_agent, ceo_input))
+        logger.debug(f"Prefetching BA analysis for: {ceo_input}")
+
+def _take_ba_result(ceo_input: str) -> Any:
+    """Return the prefetched BA result for ceo_input, or run the analysis now if none matches."""
+    prefetch = st.session_state.pop("_ba_prefetch", None)
+    if prefetch is not None and prefetch[0] == ceo_input:
+        return prefetch[1].result()
+    from src.agents import run_ba_agent
+
+    return run_ba_agent(ceo_input)
+
+def _get_task_estimates(tasks: List[str]) -> Dict[str, Any]:
+    """
+    Return (duration, sub-tasks) for each task, estimating only tasks not seen this session.
+
+    Missing tasks are estimated concurrently, so reruns of step 4 cost no LLM calls.
+    A prefetch started after analysis is awaited and merged first, so tasks it is
+    already estimating are never requested a second time.
+
+    Args:
+        tasks: Task descriptions shown in step 4.
+
+    Returns:
+        Dictionary mapping each task to its (duration in hours, sub-tasks) estimate.
+    """
+    estimates = st.session_state.setdefault("_task_estimates", {})
+    prefetch = st.session_state.pop("_estimate_prefetch", None)
+    if prefetch is not None:
+        prefetched_tasks, future = prefetch
+        try:
+            estimates.update(zip(prefetched_tasks, future.result()))
+        except Exception as e:
+            logger.error(f"Task estimate prefetch failed: {e}")
+    missing = list(dict.fromkeys(t for t in tasks if t not in estimates))
+    if missing:
+        from src.agents import batch_task_processing_many
+
+        with st.spinner(f"Estimating {len(missing)} task{'s' if len(missing) > 1 else ''}..."):
+            estimates.update(zip(missing, batch_task_processing_many(missing)))
+    return estimates
+
+def _cached_frame(name: str, rows: Any, build: Callable[[], "pd.DataFrame"]) -> "pd.DataFrame":
+    """
+    Return the editor DataFrame built on an earlier rerun if its rows are unchanged.
+
+    Args:
+        name: Editor the frame belongs to.
+        rows: Data the frame is built from; its JSON encoding is the cache key.
+        build: Builds the frame on a miss.
+
+    Returns:
+        The cached or newly built DataFrame.
+    """
+    cache = st.session_state.setdefault("_frame_cache", {})
+    key = orjson.dumps(rows, default=str)
+    hit = cache.get(name)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    frame = build()
+    cache[name] = (key, frame)
+    return frame
+
+def _upsert_task_board(task_board: List[Dict], task_entry: Dict) -> None:
+    """Replace the board entry for task_entry's task, or append it, keeping task_board_index in sync."""
+    index = get_task_board_index()
+    idx = index.get(task_entry["task"])
+    if idx is not None:
+        task_board[idx] = task_entry
+    else:
+        index[task_entry["task"]] = len(task_board)
+        task_board.append(task_entry)
+    st.session_state.task_board = task_board
+
+def _prefetch_task_estimates(output: Optional[Dict]) -> None:
+    """
+    Start estimating the analyzed tasks while the user reviews the spec.
+
+    The Future is kept in session state with its task list so step 4 waits for
+    it instead of issuing the same LLM calls again.
+    """
+    tasks = list(dict.fromkeys(t for t in (output or {}).get("tasks", []) if isinstance(t, str) and t.strip()))
+    if tasks:
+        from src.agents import batch_task_processing_many
+
+        st.session_state["_estimate_prefetch"] = (tasks, _PREFETCH_POOL.submit(batch_task_processing_many, tasks))
+
+def _project_plan_bytes() -> bytes:
+    """
+    Return the exported project plan as indented JSON bytes.
+
+    The bytes are rebuilt only when the session state revision changes, so
+    reruns of step 6 do not re-serialize an unchanged plan.
+    """
+    ss = st.session_state
+    revision = ss.get("_state_revision", 0)
+    cached = ss.get("_plan_bytes")
+    if cached is not None and cached[0] == revision:
+        return cached[1]
+
+    output = ss.get("output", {})
+    project_plan = {
+        "project": ss.get("ceo_input", ""),
+        "technical_spec": output.get("technical_spec", ""),
+        "tasks": ss.get("task_board", []),
+        "sub_tasks": ss.get("sub_tasks", {}),
+        "resources": output.get("resources", {}),
+    }
+    data = orjson.dumps(project_plan, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    ss._plan_bytes = (revision, data)
+    return data
+
 def render_step_1_ceo_input() -> None:
     """Render Step 1: Collect and analyze CEO input."""
     st.subheader("👩‍💼 CEO Input")
@@ -31,24 +189,26 @@ def render_step_1_ceo_input() -> None:
         height=150,
         placeholder="e.g., Build a vendor dashboard",
         key="ceo_input_text",
-        help="Enter a brief project description for analysis."
+        help="Enter a brief project description for analysis.",
+        on_change=_on_ceo_input_change,
     )
-    if ceo_input != st.session_state.get("ceo_input"):
-        st.session_state.ceo_input = ceo_input
-        save_state_to_history()
 
     if st.button("Analyze Requirement", help="Analyze the input with AI"):
         if not ceo_input.strip():
             st.error("Please enter a requirement.", icon="⚠️")
             return
         with st.spinner("Analyzing requirement..."):
-            result = run_ba_agent(ceo_input)
+            result = _take_ba_result(ceo_input)
             if result is None:
                 st.error("Analysis failed. Please try again or check logs.", icon="❌")
                 logger.error(f"BA agent failed for input: {ceo_input}")
             else:
+                from src.utils.utils import parse_json_output
+
                 output = parse_json_output(result)
                 st.session_state.output = output
+                _prefetch_task_estimates(output)
+                mark_dirty("output")
                 save_state_to_history()
                 st.success("Analysis complete!", icon="✅")
                 go_to_next_step()
@@ -67,17 +227,17 @@ def render_step_2_technical_spec() -> None:
     if isinstance(tech_spec, dict):
         tech_spec = tech_spec.get("overview", "")
         output["technical_spec"] = tech_spec
+        mark_dirty("output")
 
-    updated_tech_spec = st.text_area(
+    st.text_area(
         "Technical Specification",
         value=tech_spec,
         height=300,
         key="tech_spec_text",
         help="Edit the AI-generated technical specification.",
+        on_change=_on_tech_spec_change,
     )
-    if updated_tech_spec != tech_spec:
-        st.session_state.output["technical_spec"] = updated_tech_spec
-        save_state_to_history()
+    if st.session_state.pop("_tech_spec_updated", False):
         st.info("Technical specification updated.")
 
     col1, col2 = st.columns(2)
@@ -92,6 +252,8 @@ def render_step_2_technical_spec() -> None:
 
 def render_step_3_task_planning() -> None:
     """Render Step 3: Plan tasks, skills, dependencies, and resources."""
+    import pandas as pd
+
     st.subheader("📌 Task & Skill Breakdown")
     output = st.session_state.get("output")
     if not output:
@@ -104,35 +266,47 @@ def render_step_3_task_planning() -> None:
     if tasks and not isinstance(tasks[0], dict):
         tasks = [{"task": t, "priority": "Medium"} for t in tasks if isinstance(t, str)]
         output["tasks"] = tasks
+        mark_dirty("output")
 
-    tasks_df = pd.DataFrame(tasks or [{"task": "", "priority": "Medium"}])
+    tasks_df = _cached_frame("tasks", tasks, lambda: pd.DataFrame(tasks or [{"task": "", "priority": "Medium"}]))
     edited_tasks = st.data_editor(
         tasks_df,
         num_rows="dynamic",
         key="tasks_editor",
+        on_change=_flag_edit,
+        args=("tasks_editor",),
         column_config={
             "task": st.column_config.TextColumn("Task", required=True),
             "priority": st.column_config.SelectboxColumn("Priority", options=["Low", "Medium", "High"], default="Medium"),
         },
     )
-    if not edited_tasks.equals(tasks_df):
+    if _take_edit("tasks_editor"):
         output["tasks"] = [row for row in edited_tasks.to_dict("records") if row["task"].strip()]
+        mark_dirty("output")
         save_state_to_history()
 
     col1, col2 = st.columns(2)
     with col1:
         st.markdown("#### Dependencies")
-        deps_df = pd.DataFrame(output.setdefault("dependencies", []), columns=["Dependency"])
-        edited_deps = st.data_editor(deps_df, num_rows="dynamic", key="deps_editor")
-        if not edited_deps.equals(deps_df):
+        dependencies = output.setdefault("dependencies", [])
+        deps_df = _cached_frame("dependencies", dependencies, lambda: pd.DataFrame(dependencies, columns=["Dependency"]))
+        edited_deps = st.data_editor(
+            deps_df, num_rows="dynamic", key="deps_editor", on_change=_flag_edit, args=("deps_editor",)
+        )
+        if _take_edit("deps_editor"):
             output["dependencies"] = edited_deps["Dependency"].tolist()
+            mark_dirty("output")
             save_state_to_history()
     with col2:
         st.markdown("#### Skills")
-        skills_df = pd.DataFrame(output.setdefault("skills", []), columns=["Skill"])
-        edited_skills = st.data_editor(skills_df, num_rows="dynamic", key="skills_editor")
-        if not edited_skills.equals(skills_df):
+        skills = output.setdefault("skills", [])
+        skills_df = _cached_frame("skills", skills, lambda: pd.DataFrame(skills, columns=["Skill"]))
+        edited_skills = st.data_editor(
+            skills_df, num_rows="dynamic", key="skills_editor", on_change=_flag_edit, args=("skills_editor",)
+        )
+        if _take_edit("skills_editor"):
             output["skills"] = edited_skills["Skill"].tolist()
+            mark_dirty("output")
             save_state_to_history()
 
     st.markdown("#### Resources")
@@ -140,10 +314,12 @@ def render_step_3_task_planning() -> None:
     tabs = st.tabs(list(resources.keys()))
     for tab, key in zip(tabs, resources.keys()):
         with tab:
-            df = pd.DataFrame({"Resource": resources[key]})
-            edited = st.data_editor(df, num_rows="dynamic", key=f"{key}_editor")
-            if not edited.equals(df):
+            df = _cached_frame(f"resources_{key}", resources[key], lambda: pd.DataFrame({"Resource": resources[key]}))
+            editor_key = f"{key}_editor"
+            edited = st.data_editor(df, num_rows="dynamic", key=editor_key, on_change=_flag_edit, args=(editor_key,))
+            if _take_edit(editor_key):
                 resources[key] = edited["Resource"].tolist()
+                mark_dirty("output")
                 save_state_to_history()
 
     col1, col2 = st.columns(2)
@@ -160,16 +336,25 @@ def render_step_3_task_planning() -> None:
 
 def render_step_4_task_assignment() -> None:
     """Render Step 4: Assign tasks to employees."""
+    import pandas as pd
+    from src.agents import load_employee_directory
+    from src.services.task_matcher import get_similarity_scores
+    from src.core.task_processing import check_employees_for_task, assign_subtasks_to_employees
+    from src.utils.utils import hours_to_days
+
     st.subheader("👥 Task Assignment")
-    output = st.session_state.get("output")
-    task_board = st.session_state.get("task_board", [])
+    ss = st.session_state
+    output = ss.get("output")
+    task_board = ss.get("task_board", [])
+    sub_tasks_by_task = ss.setdefault("sub_tasks", {})
     if not output or not output.get("tasks"):
         st.error("Please complete Task Planning first.", icon="⚠️")
         if st.button("Return to Task Planning"):
             reset_to_step(3)
         return
 
-    employees = load_employees()
+    directory = load_employee_directory()
+    employees = directory.employees
     if not employees:
         st.error("No employees available. Check employees.json.", icon="❌")
         return
@@ -177,16 +362,18 @@ def render_step_4_task_assignment() -> None:
     with st.expander("Available Employees", expanded=DEBUG):
         st.dataframe(pd.DataFrame([{"Name": e["name"], "Role": e["role"]} for e in employees]))
 
-    assignment_responses = st.session_state.setdefault("assignment_responses", {})
+    assignment_responses = ss.setdefault("assignment_responses", {})
+    task_board_index = get_task_board_index()
+    estimates = _get_task_estimates([t["task"] for t in output["tasks"]])
     for task_entry in output["tasks"]:
         task = task_entry["task"]
         priority = task_entry.get("priority", "Medium")
 
         with st.container():
             st.markdown(f"### 📋 Task: `{task}` (Priority: {priority})")
-            duration, sub_tasks = batch_task_processing(task)
+            duration, sub_tasks = estimates[task]
             adjusted_duration = max(2.0, duration * 0.75)
-            days_needed = max(1, (adjusted_duration + HOURS_PER_DAY - 1) // HOURS_PER_DAY)
+            days_needed = hours_to_days(adjusted_duration)
 
             st.write(f"Estimated Duration: {adjusted_duration:.1f} hours (~{days_needed} day{'s' if days_needed > 1 else ''})")
 
@@ -213,57 +400,50 @@ def render_step_4_task_assignment() -> None:
                 if st.button(f"AI Suggest Employees", key=f"suggest_{task}", help="Use AI to suggest team"):
                     with st.spinner("Finding matches..."):
                         scored_employees = get_similarity_scores(task, employees)
-                        assigned, responses = check_employees_for_task(task, employees, scored_employees, MAX_EMPLOYEES_PER_TASK)
+                        assigned, responses = check_employees_for_task(task, directory, scored_employees, MAX_EMPLOYEES_PER_TASK)
                         if assigned:
                             task_entry = {
                                 "task": task,
                                 "employees": [e["name"] for e in assigned],
-                                "emails": [e["email"] for e in assigned],
+                                "emails": [e.get("email", "") for e in assigned],
                                 "deadline": deadline.strftime("%Y-%m-%d"),
                                 "duration": duration_input,
-                                "days_needed": max(1, (duration_input + HOURS_PER_DAY - 1) // HOURS_PER_DAY),
+                                "days_needed": hours_to_days(duration_input),
                                 "priority": priority,
                             }
-                            idx = next((i for i, t in enumerate(task_board) if t["task"] == task), None)
-                            if idx is not None:
-                                task_board[idx] = task_entry
-                            else:
-                                task_board.append(task_entry)
-                            st.session_state.task_board = task_board
-                            st.session_state.sub_tasks[task] = assign_subtasks_to_employees(sub_tasks, assigned)
+                            _upsert_task_board(task_board, task_entry)
+                            sub_tasks_by_task[task] = assign_subtasks_to_employees(sub_tasks, assigned)
                             assignment_responses[task] = responses
+                            mark_dirty("task_board", "sub_tasks", "assignment_responses")
                             save_state_to_history()
                             st.success(f"Assigned {len(assigned)} employees!", icon="✅")
                             logger.info(f"AI assigned {len(assigned)} employees to '{task}'")
 
             with col2:
-                existing_assigned = next((t["employees"] for t in task_board if t["task"] == task), [])
+                idx = task_board_index.get(task)
+                existing_assigned = task_board[idx]["employees"] if idx is not None else []
                 selected_employees = st.multiselect(
                     "Select Employees",
-                    options=[e["name"] for e in employees],
+                    options=directory.names,
                     default=existing_assigned,
                     key=f"manual_{task}",
                     max_selections=MAX_EMPLOYEES_PER_TASK,
                     help="Manually select team members",
                 )
                 if selected_employees != existing_assigned and selected_employees:
-                    assigned = [e for e in employees if e["name"] in selected_employees]
+                    assigned = [directory.by_name[name] for name in selected_employees]
                     task_entry = {
                         "task": task,
                         "employees": selected_employees,
-                        "emails": [e["email"] for e in assigned],
+                        "emails": [e.get("email", "") for e in assigned],
                         "deadline": deadline.strftime("%Y-%m-%d"),
                         "duration": duration_input,
-                        "days_needed": max(1, (duration_input + HOURS_PER_DAY - 1) // HOURS_PER_DAY),
+                        "days_needed": hours_to_days(duration_input),
                         "priority": priority,
                     }
-                    idx = next((i for i, t in enumerate(task_board) if t["task"] == task), None)
-                    if idx is not None:
-                        task_board[idx] = task_entry
-                    else:
-                        task_board.append(task_entry)
-                    st.session_state.task_board = task_board
-                    st.session_state.sub_tasks[task] = assign_subtasks_to_employees(sub_tasks, assigned)
+                    _upsert_task_board(task_board, task_entry)
+                    sub_tasks_by_task[task] = assign_subtasks_to_employees(sub_tasks, assigned)
+                    mark_dirty("task_board", "sub_tasks")
                     save_state_to_history()
                     st.success(f"Manually assigned {len(selected_employees)} employees!", icon="✅")
                     logger.info(f"Manually assigned {len(selected_employees)} employees to '{task}'")
@@ -275,9 +455,11 @@ def render_step_4_task_assignment() -> None:
     if task_board:
         st.subheader("Current Task Board")
         st.dataframe(pd.DataFrame(task_board)[["task", "employees", "deadline", "duration", "priority"]])
-        approval = st.checkbox("Scrum Master Approval", value=st.session_state.get("scrum_master_approval", False))
-        if approval != st.session_state.get("scrum_master_approval"):
-            st.session_state.scrum_master_approval = approval
+        current_approval = ss.get("scrum_master_approval", False)
+        approval = st.checkbox("Scrum Master Approval", value=current_approval)
+        if approval != current_approval:
+            ss.scrum_master_approval = approval
+            mark_dirty("scrum_master_approval")
             save_state_to_history()
 
         col1, col2 = st.columns(2)
@@ -292,8 +474,12 @@ def render_step_4_task_assignment() -> None:
 
 def render_step_5_subtasks() -> None:
     """Render Step 5: Manage sub-tasks for assigned tasks."""
+    import pandas as pd
+
     st.subheader("🔍 Sub-tasks Management")
-    task_board = st.session_state.get("task_board", [])
+    ss = st.session_state
+    task_board = ss.get("task_board", [])
+    sub_tasks_by_task = ss.setdefault("sub_tasks", {})
     if not task_board:
         st.error("No tasks assigned yet.", icon="⚠️")
         if st.button("Return to Task Assignment"):
@@ -306,20 +492,23 @@ def render_step_5_subtasks() -> None:
             task = task_entry["task"]
             st.markdown(f"### Sub-tasks for: {task}")
             st.write(f"**Deadline:** {task_entry['deadline']} | **Team:** {', '.join(task_entry['employees'])}")
-            sub_tasks = st.session_state.get("sub_tasks", {}).get(task, [])
+            sub_tasks = sub_tasks_by_task.get(task, [])
             sub_tasks_df = pd.DataFrame(sub_tasks)
             edited_sub_tasks = st.data_editor(
                 sub_tasks_df,
                 num_rows="dynamic",
                 key=f"subtasks_edit_{task}",
+                on_change=_flag_edit,
+                args=(f"subtasks_edit_{task}",),
                 column_config={
                     "sub_task": "Sub-Task",
                     "help": "Help Text",
                     "assigned": st.column_config.SelectboxColumn("Assigned", options=[""] + task_entry["employees"]),
                 },
             )
-            if not edited_sub_tasks.equals(sub_tasks_df):
-                st.session_state.sub_tasks[task] = edited_sub_tasks.to_dict("records")
+            if _take_edit(f"subtasks_edit_{task}"):
+                sub_tasks_by_task[task] = edited_sub_tasks.to_dict("records")
+                mark_dirty("sub_tasks")
                 save_state_to_history()
             if st.button(f"Save Sub-tasks", key=f"save_subtasks_{task}"):
                 st.success(f"Sub-tasks saved for '{task}'!", icon="💾")
@@ -338,55 +527,51 @@ def render_step_5_subtasks() -> None:
 def render_step_6_project_report() -> None:
     """Render Step 6: Generate and export project report."""
     st.subheader("📊 Project Report")
-    task_board = st.session_state.get("task_board", [])
+    ss = st.session_state
+    task_board = ss.get("task_board", [])
     if not task_board:
         st.error("No tasks assigned yet.", icon="⚠️")
         if st.button("Return to Sub-tasks"):
             reset_to_step(5)
         return
 
-    report = [
-        f"Project: {st.session_state.get('ceo_input', 'Unnamed Project')}",
-        f"Technical Specification: {json.dumps(st.session_state.get('output', {}).get('technical_spec', ''), indent=2)}",
-        "\nResources:",
-    ]
-    for category, items in st.session_state.get("output", {}).get("resources", {}).items():
-        report.append(f"  {category.capitalize()}: {', '.join(items) or 'None'}")
-    report.append("\nTasks and Assignments:")
+    output = ss.get("output", {})
+    all_sub_tasks = ss.get("sub_tasks", {})
+    tech_spec = output.get("technical_spec", "")
+    if not isinstance(tech_spec, str):
+        tech_spec = orjson.dumps(tech_spec, option=orjson.OPT_INDENT_2).decode()
+
+    report = io.StringIO()
+    report.write(f"Project: {ss.get('ceo_input', 'Unnamed Project')}\n")
+    report.write(f"Technical Specification: {tech_spec}\n")
+    report.write("\nResources:\n")
+    for category, items in output.get("resources", {}).items():
+        report.write(f"  {category.capitalize()}: {', '.join(items) or 'None'}\n")
+    report.write("\nTasks and Assignments:")
     for task_entry in task_board:
-        report.extend([
-            f"- Task: {task_entry['task']}",
-            f"  Employees: {', '.join(task_entry['employees'])}",
-            f"  Deadline: {task_entry['deadline']}",
-            f"  Duration: {task_entry['duration']} hours",
-            f"  Priority: {task_entry['priority']}",
-        ])
-        if task_entry["task"] in st.session_state.get("sub_tasks", {}):
-            report.append("  Sub-tasks:")
-            report.extend([
-                f"    - {st['sub_task']} (Assigned: {st['assigned']})"
-                for st in st.session_state["sub_tasks"][task_entry["task"]]
-            ])
-
-    st.text_area("Full Project Report", "\n".join(report), height=400, key="project_report_text")
+        report.write(
+            f"\n- Task: {task_entry['task']}"
+            f"\n  Employees: {', '.join(task_entry['employees'])}"
+            f"\n  Deadline: {task_entry['deadline']}"
+            f"\n  Duration: {task_entry['duration']} hours"
+            f"\n  Priority: {task_entry['priority']}"
+        )
+        if task_entry["task"] in all_sub_tasks:
+            report.write("\n  Sub-tasks:")
+            for sub_task in all_sub_tasks[task_entry["task"]]:
+                report.write(f"\n    - {sub_task['sub_task']} (Assigned: {sub_task['assigned']})")
+
+    st.text_area("Full Project Report", report.getvalue(), height=400, key="project_report_text")
 
     col1, col2 = st.columns(2)
     with col1:
         if st.button("Back to Sub-tasks"):
             go_to_previous_step()
     with col2:
-        if st.button("Export Project Plan"):
-            project_plan = {
-                "project": st.session_state.get("ceo_input", ""),
-                "technical_spec": st.session_state.get("output", {}).get("technical_spec", ""),
-                "tasks": task_board,
-                "sub_tasks": st.session_state.get("sub_tasks", {}),
-                "resources": st.session_state.get("output", {}).get("resources", {}),
-            }
-            st.download_button(
-                "Download JSON",
-                data=json.dumps(project_plan, indent=2),
-                file_name="project_plan.json",
-                mime="application/json",
-            )
-            logger.info("Exported project plan")
\ No newline at end of file
+        st.download_button(
+            "Export Project Plan",
+            data=_project_plan_bytes(),
+            file_name="project_plan.json",
+            mime="application/json",
+            on_click=lambda: logger.info("Exported project plan"),
+        )
\ No newline at end of file
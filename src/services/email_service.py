@@ -1,20 +1,180 @@
 # src/services/email_service.py
 """
 Email notification service for the Task Manager application.
-Sends task assignment notifications to employees (currently placeholder).
+Sends task assignment notifications to employees over a shared SMTP connection
+(log-only placeholder unless EMAIL_ENABLED is set).
 """
 
+import atexit
 import logging
-from typing import Dict, Any
+import smtplib
+import threading
+from email import encoders
+from email.mime.base import MIMEBase
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Dict, Any, List, Optional, Tuple
 from dotenv import load_dotenv
+from tenacity import retry, stop_after_attempt, wait_exponential, before_sleep_log
 import os
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# SMTP settings are read once at import
+EMAIL_ENABLED = os.getenv("EMAIL_ENABLED", "false").lower() == "true"
+EMAIL_SENDER = os.getenv("EMAIL_SENDER")
+EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
+SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
+
+_MSG_TMPL = "Notification for %s (%s): Task assigned - %s"
+_SUBJECT = "New Task Assignment"
+_BODY_TEMPLATE = (
+    "<p>Dear {name},</p>"
+    "<p>You have been assigned the following task: <b>{task}</b></p>"
+    "<p>Please check the Task Manager for details.</p>"
+    "<p>Best regards,<br>Task Manager Team</p>"
+)
+
+# One authenticated connection shared by every send; opened on first use
+_smtp_pool: Optional[smtplib.SMTP] = None
+_smtp_lock = threading.Lock()
+
+def _connect() -> smtplib.SMTP:
+    """
+    Open and authenticate a new SMTP connection.
+
+    Returns:
+        Logged-in SMTP connection.
+
+    Raises:
+        ValueError: If EMAIL_SENDER or EMAIL_PASSWORD is not set.
+    """
+    if not EMAIL_SENDER or not EMAIL_PASSWORD:
+        logger.error("Missing EMAIL_SENDER or EMAIL_PASSWORD in .env")
+        raise ValueError("Email credentials must be set in environment variables.")
+    server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
+    server.starttls()
+    server.login(EMAIL_SENDER, EMAIL_PASSWORD)
+    logger.debug("Connected to SMTP server %s:%s", SMTP_SERVER, SMTP_PORT)
+    return server
+
+def _deliver(msg: MIMEMultipart) -> None:
+    """
+    Send msg over the shared connection, reconnecting once if the server dropped it.
+
+    The caller must hold _smtp_lock.
+
+    Raises:
+        ValueError: If email credentials are missing.
+        smtplib.SMTPException: If sending fails.
+    """
+    global _smtp_pool
+    if _smtp_pool is None:
+        _smtp_pool = _connect()
+    try:
+        _smtp_pool.send_message(msg)
+    except smtplib.SMTPServerDisconnected:
+        _smtp_pool = _connect()
+        _smtp_pool.send_message(msg)
+
+def _send_pooled(msgs: List[MIMEMultipart]) -> int:
+    """
+    Send msgs back to back over the shared connection, handling failures per recipient.
+
+    A failed message is logged and skipped; if the connection itself broke, it is
+    dropped so the next message reconnects.
+
+    Returns:
+        Number of messages delivered.
+
+    Raises:
+        ValueError: If email credentials are missing (nothing can be sent).
+    """
+    global _smtp_pool
+    sent = 0
+    with _smtp_lock:
+        for msg in msgs:
+            try:
+                _deliver(msg)
+                sent += 1
+            except (smtplib.SMTPException, OSError) as e:
+                logger.error("SMTP error sending email to %s: %s", msg["To"], e)
+                if isinstance(e, (smtplib.SMTPServerDisconnected, OSError)):
+                    _smtp_pool = None
+    return sent
+
+def _close_pool() -> None:
+    """Close the shared SMTP connection at interpreter exit."""
+    global _smtp_pool
+    with _smtp_lock:
+        if _smtp_pool is not None:
+            try:
+                _smtp_pool.quit()
+            except smtplib.SMTPException:
+                pass
+            _smtp_pool = None
+
+atexit.register(_close_pool)
+
+def _build_message(to_email: str, subject: str, body: str) -> MIMEMultipart:
+    """Build an HTML email from EMAIL_SENDER to to_email."""
+    msg = MIMEMultipart()
+    msg["From"] = EMAIL_SENDER
+    msg["To"] = to_email
+    msg["Subject"] = subject
+    msg.attach(MIMEText(body, "html"))
+    return msg
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=1, max=10),
+    before_sleep=before_sleep_log(logger, logging.DEBUG)
+)
+def send_email(to_email: str, subject: str, body: str, attachment_path: Optional[str] = None) -> None:
+    """
+    Send an HTML email over the shared SMTP connection.
+
+    Args:
+        to_email: Recipient address.
+        subject: Email subject.
+        body: HTML body.
+        attachment_path: Optional path of a file to attach.
+
+    Raises:
+        ValueError: If email credentials are missing.
+        smtplib.SMTPException: If sending fails.
+    """
+    msg = _build_message(to_email, subject, body)
+    if attachment_path:
+        try:
+            with open(attachment_path, "rb") as attachment:
+                part = MIMEBase("application", "octet-stream")
+                part.set_payload(attachment.read())
+                encoders.encode_base64(part)
+                part.add_header("Content-Disposition", f"attachment; filename={os.path.basename(attachment_path)}")
+                msg.attach(part)
+        except Exception as e:
+            logger.warning("Failed to attach %s: %s", attachment_path, e)
+
+    try:
+        with _smtp_lock:
+            _deliver(msg)
+        logger.info("Email sent to %s", to_email)
+    except smtplib.SMTPAuthenticationError as e:
+        logger.error("SMTP authentication failed: %s", e)
+        raise
+    except smtplib.SMTPException as e:
+        logger.error("SMTP error sending email to %s: %s", to_email, e)
+        raise
+
 def notify_employee(employee: Dict[str, Any], task: str) -> None:
     """
-    Notify an employee about a task assignment (placeholder until email is enabled).
+    Notify an employee about a task assignment.
+
+    load_employees does not require an email, so the record is checked here;
+    one without an email or name is logged and skipped.
 
     Args:
         employee: Dictionary with employee details (must include 'email' and 'name').
@@ -24,83 +184,63 @@ def notify_employee(employee: Dict[str, Any], task: str) -> None:
         None
 
     Note:
-        Email sending is commented out. Uncomment and configure .env variables
-        (EMAIL_SENDER, EMAIL_PASSWORD, SMTP_SERVER, SMTP_PORT) to enable.
+        Only logs the notification unless EMAIL_ENABLED=true; sending also needs
+        EMAIL_SENDER and EMAIL_PASSWORD (and optionally SMTP_SERVER, SMTP_PORT).
     """
-    if not isinstance(employee, dict) or "email" not in employee or "name" not in employee:
-        logger.error(f"Invalid employee data: {employee}")
+    try:
+        email, name = employee["email"], employee["name"]
+    except (KeyError, TypeError):
+        logger.error("Invalid employee data: %s", employee)
         return
 
-    email = employee["email"]
-    name = employee["name"]
-    message = f"Notification for {name} ({email}): Task assigned - {task}"
-    logger.info(message)
-    print(message)  # Placeholder until email is enabled
-
-    # Uncomment the following to enable email notifications:
-    """
-    import smtplib
-    from email.mime.multipart import MIMEMultipart
-    from email.mime.text import MIMEText
-    from email.mime.base import MIMEBase
-    from email import encoders
-    from tenacity import retry, stop_after_attempt, wait_exponential, before_sleep_log
-
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=10),
-        before_sleep=before_sleep_log(logger, logging.DEBUG)
-    )
-    def send_email(to_email: str, subject: str, body: str, attachment_path: str = None) -> None:
-        sender = os.getenv("EMAIL_SENDER")
-        password = os.getenv("EMAIL_PASSWORD")
-        smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-        smtp_port = int(os.getenv("SMTP_PORT", 587))
-
-        if not sender or not password:
-            logger.error("Missing EMAIL_SENDER or EMAIL_PASSWORD in .env")
-            raise ValueError("Email credentials must be set in environment variables.")
-
-        msg = MIMEMultipart()
-        msg["From"] = sender
-        msg["To"] = to_email
-        msg["Subject"] = subject
-        msg.attach(MIMEText(body, "html"))
-
-        if attachment_path:
-            try:
-                with open(attachment_path, "rb") as attachment:
-                    part = MIMEBase("application", "octet-stream")
-                    part.set_payload(attachment.read())
-                    encoders.encode_base64(part)
-                    part.add_header("Content-Disposition", f"attachment; filename={os.path.basename(attachment_path)}")
-                    msg.attach(part)
-            except Exception as e:
-                logger.warning(f"Failed to attach {attachment_path}: {e}")
+    if not EMAIL_ENABLED:
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(_MSG_TMPL, name, email, task)
+            print(_MSG_TMPL % (name, email, task))  # Placeholder until email is enabled
+        return
 
-        try:
-            with smtplib.SMTP(smtp_server, smtp_port) as server:
-                server.starttls()
-                server.login(sender, password)
-                server.send_message(msg)
-            logger.info(f"Email sent to {to_email}")
-        except smtplib.SMTPAuthenticationError as e:
-            logger.error(f"SMTP authentication failed: {e}")
-            raise
-        except smtplib.SMTPException as e:
-            logger.error(f"SMTP error sending email to {to_email}: {e}")
-            raise
-
-    subject = "New Task Assignment"
-    body = (
-        f"<p>Dear {name},</p>"
-        f"<p>You have been assigned the following task: <b>{task}</b></p>"
-        f"<p>Please check the Task Manager for details.</p>"
-        f"<p>Best regards,<br>Task Manager Team</p>"
-    )
     try:
-        send_email(email, subject, body)
-        logger.info(f"Notified {name} ({email}) about task '{task}'")
+        send_email(email, _SUBJECT, _BODY_TEMPLATE.format(name=name, task=task))
+        logger.info("Notified %s (%s) about task '%s'", name, email, task)
     except Exception as e:
-        logger.error(f"Failed to notify {name} ({email}) about task '{task}': {e}")
+        logger.error("Failed to notify %s (%s) about task '%s': %s", name, email, task, e)
+
+def notify_employees_bulk(pairs: List[Tuple[Dict[str, Any], str]]) -> int:
     """
+    Notify several employees about their task assignments in one batch.
+
+    All messages are built first and then sent back to back over the shared
+    SMTP connection, with one log line for the whole batch. A failure for one
+    recipient is logged and does not stop the rest of the batch.
+
+    Args:
+        pairs: (employee, task) tuples; employees need 'email' and 'name'.
+
+    Returns:
+        Number of notifications actually delivered (or logged, when email is disabled).
+    """
+    valid = [
+        (employee, task) for employee, task in pairs
+        if isinstance(employee, dict) and "email" in employee and "name" in employee
+    ]
+    if len(valid) < len(pairs):
+        logger.error("Skipped %s notifications with invalid employee data", len(pairs) - len(valid))
+    if not valid:
+        return 0
+
+    if not EMAIL_ENABLED:
+        if logger.isEnabledFor(logging.INFO):
+            print("\n".join(_MSG_TMPL % (e["name"], e["email"], task) for e, task in valid))  # Placeholder until email is enabled
+            logger.info("Logged %s notifications (email disabled)", len(valid))
+        return len(valid)
+
+    messages = [
+        _build_message(e["email"], _SUBJECT, _BODY_TEMPLATE.format(name=e["name"], task=task)) for e, task in valid
+    ]
+    try:
+        sent = _send_pooled(messages)
+    except ValueError as e:
+        logger.error("Failed to send bulk notifications: %s", e)
+        return 0
+    logger.info("Sent %s of %s notifications", sent, len(messages))
+    return sent
@@ -4,23 +4,127 @@ Task-employee matching service for the Task Manager application.
 Computes similarity scores between tasks and employee expertise using TF-IDF.
 """
 
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.preprocessing import normalize
+import numpy as np
 import logging
-from typing import List, Tuple, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Tuple, Dict, Any, Optional, Union, FrozenSet, Callable
 
 logger = logging.getLogger(__name__)
 
-def get_similarity_scores(task: str, employees: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], float]]:
+# Rosters whose term x employee matrix has at most this many cells are scored densely
+_DENSE_MAX_CELLS = 1 << 20
+
+# Vocabulary-free term counts: a fixed hashed feature space shared by every roster and task.
+# float32 halves the memory traffic of the (memory-bound) similarity products.
+_HASHER = HashingVectorizer(n_features=2**18, alternate_sign=False, norm=None, stop_words="english", dtype=np.float32)
+
+# One entry per employee: the skills tuple if present, else the free-text 'my_work' string
+Expertise = Tuple[Union[Tuple[str, ...], str], ...]
+
+def _expertise_key(employees: List[Dict[str, Any]]) -> Expertise:
+    """Build the hashable roster key used to cache the employee index."""
+    return tuple(tuple(emp["skills"]) if emp.get("skills") else emp.get("my_work", "") for emp in employees)
+
+# The hasher's own analyzer, so token sets match exactly the terms the vectors index
+_ANALYZE = _HASHER.build_analyzer()
+
+def _tokens(text: str) -> FrozenSet[str]:
+    """Distinct tokens of text as _HASHER sees them (lowercased, 2+ characters, no stop words)."""
+    return frozenset(_ANALYZE(text))
+
+@lru_cache(maxsize=32)
+def _expertise_tokens(expertise: Expertise) -> Tuple[FrozenSet[str], ...]:
+    """Token set of each employee's expertise, in roster order; cached per roster."""
+    return tuple(_tokens(" ".join(e) if isinstance(e, tuple) else e) for e in expertise)
+
+@lru_cache(maxsize=32)
+def _build_employee_index(expertise: Expertise) -> Callable[[List[str]], np.ndarray]:
     """
-    Compute similarity scores between a task and employee expertise.
+    Fit TF-IDF weights on a roster's hashed expertise and build its scorer; cached per roster.
+
+    The returned function is specialized to the roster: the fitted weights,
+    the employee matrix and the dense-or-sparse choice are bound into its
+    closure, so scoring does no per-call dispatch or lookups.
+
+    Skill lists are joined and tokenized here, once per roster, rather than
+    on every scoring call.
+
+    Small rosters get a dense float32 matrix restricted to the hashed terms
+    the roster actually uses: for tens to a few hundred employees a BLAS
+    product beats sparse indexing overhead.
+
+    Args:
+        expertise: Skills tuple or 'my_work' text of each employee, in roster order.
+
+    Returns:
+        Function mapping task descriptions to a dense (tasks x employees) array
+        of cosine similarities.
+    """
+    counts = _HASHER.transform([" ".join(e) if isinstance(e, tuple) else e for e in expertise])
+    transformer = TfidfTransformer(norm=None).fit(counts)
+    # Weighted and L2-normalized in place, once per roster; stored transposed so scoring is a single product
+    employee_matrix = normalize(transformer.transform(counts, copy=False), norm="l2", copy=False)
+    employee_matrix = employee_matrix.T.tocsr().astype(np.float32, copy=False)
+    terms = np.flatnonzero(employee_matrix.getnnz(axis=1))
+    logger.debug("Built TF-IDF index over %s employees (%s terms)", len(expertise), len(terms))
+
+    def weigh(tasks: List[str]) -> Any:
+        """Hash, weight and L2-normalize tasks with this roster's IDF."""
+        task_matrix = normalize(transformer.transform(_HASHER.transform(tasks), copy=False), norm="l2", copy=False)
+        return task_matrix.astype(np.float32, copy=False)
+
+    if len(terms) * len(expertise) <= _DENSE_MAX_CELLS:
+        dense_matrix = employee_matrix[terms].toarray()
+
+        def score_dense(tasks: List[str]) -> np.ndarray:
+            return weigh(tasks)[:, terms].toarray() @ dense_matrix
+
+        return score_dense
+
+    employee_matrix.sort_indices()  # Sorted column indices keep the sparse product cache-friendly
+
+    def score_sparse(tasks: List[str]) -> np.ndarray:
+        return (weigh(tasks) @ employee_matrix).toarray()
+
+    return score_sparse
+
+@lru_cache(maxsize=256)
+def _similarity_scores(task: str, expertise: Expertise) -> Tuple[float, ...]:
+    """
+    Score a task against employee expertise; cached per (task, roster expertise).
+
+    The TF-IDF weights are fitted on the roster once and only transform the
+    task, so new tasks against the same roster skip IDF recomputation.
+    Task and employee vectors are both unit length, so their dot product is
+    the cosine similarity.
 
     Args:
         task: Task description to match against.
-        employees: List of employee dictionaries with 'skills' and 'my_work' fields.
+        expertise: Skills tuple or 'my_work' text of each employee, in roster order.
 
     Returns:
-        List of tuples (employee, similarity_score) sorted by score descending.
+        Cosine similarity of the task to each employee, in the same order.
+    """
+    return tuple(_score_matrix([task], expertise)[0].tolist())
+
+def _score_matrix(tasks: List[str], expertise: Expertise) -> np.ndarray:
+    """
+    Score several tasks against a roster in one matrix product.
+
+    Args:
+        tasks: Task descriptions to match.
+        expertise: Skills tuple or 'my_work' text of each employee, in roster order.
+
+    Returns:
+        Dense (tasks x employees) array of cosine similarities.
+    """
+    return _build_employee_index(expertise)(tasks)
+
+def _validate_inputs(task: str, employees: List[Dict[str, Any]]) -> None:
+    """
+    Reject inputs that cannot be scored.
 
     Raises:
         ValueError: If task is empty or employees list is invalid.
@@ -29,55 +133,169 @@ def get_similarity_scores(task: str, employees: List[Dict[str, Any]]) -> List[Tu
         logger.warning("Empty task provided for similarity scoring.")
         raise ValueError("Task description cannot be empty.")
     if not employees or not isinstance(employees, list):
-        logger.warning(f"Invalid employees list: {employees}")
+        logger.warning("Invalid employees list: %s", employees)
         raise ValueError("Employees must be a non-empty list.")
 
+def get_similarity_scores(task: str, employees: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], float]]:
+    """
+    Compute similarity scores between a task and employee expertise.
+
+    Args:
+        task: Task description to match against.
+        employees: List of employee dictionaries with 'skills' and 'my_work' fields.
+
+    Returns:
+        List of tuples (employee, similarity_score) sorted by score descending.
+
+    Raises:
+        ValueError: If task is empty or employees list is invalid.
+    """
+    _validate_inputs(task, employees)
     try:
         # Prefer 'skills' field if available, fall back to 'my_work'
-        employee_texts = [
-            " ".join(emp.get("skills", [])) if emp.get("skills") else emp.get("my_work", "")
-            for emp in employees
-        ]
-        if not any(employee_texts):
+        expertise = _expertise_key(employees)
+        if not any(expertise):
             logger.warning("No valid expertise data (skills or my_work) found in employees.")
             return [(emp, 0.0) for emp in employees]
 
-        texts = [task] + employee_texts
-        vectorizer = TfidfVectorizer(stop_words="english").fit_transform(texts)
-        task_vector = vectorizer[0:1]
-        employee_vectors = vectorizer[1:]
-        sim_scores = cosine_similarity(task_vector, employee_vectors).flatten()
+        # Repeat suggestions and history navigation reuse the cached scores
+        sim_scores = _similarity_scores(task, expertise)
         scores = list(zip(employees, sim_scores))
 
-        logger.info(f"Computed similarity scores for task '{task}' across {len(employees)} employees")
+        logger.info("Computed similarity scores for task '%s' across %s employees", task, len(employees))
         return sorted(scores, key=lambda x: x[1], reverse=True)
     except Exception as e:
-        logger.error(f"Error computing similarity scores for task '{task}': {e}")
+        logger.error("Error computing similarity scores for task '%s': %s", task, e)
         return [(emp, 0.0) for emp in employees]
 
+def get_top_k(task: str, employees: List[Dict[str, Any]], k: int = 5) -> List[Tuple[Dict[str, Any], float]]:
+    """
+    Return the k employees most similar to a task, best first.
+
+    Selects with np.argpartition in linear time and sorts only the k winners,
+    instead of sorting the whole roster like get_similarity_scores.
+
+    Args:
+        task: Task description to match against.
+        employees: List of employee dictionaries with 'skills' and 'my_work' fields.
+        k: Number of employees to return.
+
+    Returns:
+        Up to k tuples (employee, similarity_score) sorted by score descending.
+
+    Raises:
+        ValueError: If task is empty or employees list is invalid.
+    """
+    _validate_inputs(task, employees)
+    k = min(k, len(employees))
+    if k <= 0:
+        return []
+    try:
+        expertise = _expertise_key(employees)
+        if not any(expertise):
+            logger.warning("No valid expertise data (skills or my_work) found in employees.")
+            return [(emp, 0.0) for emp in employees[:k]]
+
+        sim_scores = np.asarray(_similarity_scores(task, expertise))
+        top = np.argpartition(-sim_scores, k - 1)[:k]
+        top = top[np.argsort(-sim_scores[top], kind="stable")]
+        return [(employees[i], float(sim_scores[i])) for i in top]
+    except Exception as e:
+        logger.error("Error computing top %s matches for task '%s': %s", k, task, e)
+        return [(emp, 0.0) for emp in employees[:k]]
+
 def find_best_match(task: str, employees: List[Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], float]:
     """
     Find the employee with the highest similarity score for a task.
 
+    Employees sharing no token with the task are pruned by a set-overlap
+    check before any TF-IDF scoring; each survivor's cosine score is weighted
+    by its match ratio (shared tokens / task tokens).
+
     Args:
         task: Task description to match against.
         employees: List of employee dictionaries with 'skills' and 'my_work' fields.
 
     Returns:
-        Tuple of (best matching employee, similarity_score), or (None, 0.0) if no match.
+        Tuple of (best matching employee, match score), or (None, 0.0) if no match.
     """
     try:
-        scores = get_similarity_scores(task, employees)
+        task_tokens = _tokens(task) if task and task.strip() else frozenset()
+        if task_tokens and employees and isinstance(employees, list):
+            expertise = _expertise_key(employees)
+            ratios = [len(task_tokens & tokens) / len(task_tokens) for tokens in _expertise_tokens(expertise)]
+            candidates = [i for i, ratio in enumerate(ratios) if ratio]
+            if not candidates:
+                logger.info("No matches found for task '%s'", task)
+                return None, 0.0
+
+            sim_scores = _similarity_scores(task, expertise)
+            best = max(candidates, key=lambda i: sim_scores[i] * ratios[i])
+            best_emp, best_score = employees[best], sim_scores[best] * ratios[best]
+            logger.info("Best match for '%s': %s with score %.2f", task, best_emp['name'], best_score)
+            return best_emp, best_score
+
+        # Stop-word-only or invalid input: get_top_k validates and scores it
+        scores = get_top_k(task, employees, k=1)
         if not scores:
-            logger.info(f"No matches found for task '{task}'")
+            logger.info("No matches found for task '%s'", task)
             return None, 0.0
 
         best_emp, best_score = scores[0]  # First item after sorting by score descending
-        logger.info(f"Best match for '{task}': {best_emp['name']} with score {best_score:.2f}")
+        logger.info("Best match for '%s': %s with score %.2f", task, best_emp['name'], best_score)
         return best_emp, best_score
     except ValueError as e:
-        logger.warning(f"Invalid input for best match: {e}")
+        logger.warning("Invalid input for best match: %s", e)
+        return None, 0.0
+    except Exception as e:
+        logger.error("Error finding best match for '%s': %s", task, e)
         return None, 0.0
+
+def find_best_matches_batch(tasks: List[str], employees: List[Dict[str, Any]]) -> List[Tuple[Optional[Dict[str, Any]], float]]:
+    """
+    Find the best matching employee for each of several tasks at once.
+
+    All tasks are scored against the cached roster index in a single matrix
+    product; the per-task result matches find_best_match, including the
+    match-ratio weighting and pruning.
+
+    Args:
+        tasks: Task descriptions to match.
+        employees: List of employee dictionaries with 'skills' and 'my_work' fields.
+
+    Returns:
+        One (best matching employee, match score) tuple per task, in order;
+        (None, 0.0) for empty tasks or tasks with no match.
+    """
+    results: List[Tuple[Optional[Dict[str, Any]], float]] = [(None, 0.0)] * len(tasks)
+    if not employees or not isinstance(employees, list):
+        logger.warning("Invalid employees list: %s", employees)
+        return results
+
+    try:
+        valid = [k for k, task in enumerate(tasks) if task and task.strip()]
+        expertise = _expertise_key(employees)
+        if not valid or not any(expertise):
+            return results
+
+        employee_tokens = _expertise_tokens(expertise)
+        # Stop-word-only tasks are ranked on cosine score alone, as in find_best_match
+        ratios = np.array(
+            [
+                [len(task_tokens & tokens) / len(task_tokens) if task_tokens else 1.0 for tokens in employee_tokens]
+                for task_tokens in (_tokens(tasks[k]) for k in valid)
+            ],
+            dtype=np.float32,
+        )
+        weighted = _score_matrix([tasks[k] for k in valid], expertise) * ratios
+        weighted[ratios == 0] = -1.0  # Pruned employees can never win
+        best = weighted.argmax(axis=1)
+        for row, k in enumerate(valid):
+            i = best[row]
+            if weighted[row, i] >= 0:
+                results[k] = (employees[i], float(weighted[row, i]))
+        logger.info("Matched %s tasks across %s employees", len(valid), len(employees))
+        return results
     except Exception as e:
-        logger.error(f"Error finding best match for '{task}': {e}")
-        return None, 0.0
\ No newline at end of file
+        logger.error("Error finding best matches for %s tasks: %s", len(tasks), e)
+        return [(None, 0.0)] * len(tasks)
@@ -0,0 +1,187 @@
+# src/utils/cache.py
+"""
+Response caching for the Task Manager application.
+Reuses LLM results for prompts already answered, or near-duplicates of them.
+"""
+
+import atexit
+import orjson
+import os
+import tempfile
+import threading
+import logging
+from typing import Any, Dict, List, Optional
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from src.config import CACHE_DIR, SEMANTIC_CACHE_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+_WRITE_DEBOUNCE = 2.0  # Seconds to collect further sets before writing the file
+_MIN_LENGTH_RATIO = 0.8  # Shorter/longer prompt length below this is never a hit
+
+# Stateless, so n-grams that occur only in the query still count against the match
+_HASHER = HashingVectorizer(analyzer="char_wb", ngram_range=(3, 5), alternate_sign=False, norm="l2")
+
+class SemanticCache:
+    """Similarity-keyed store of LLM responses, persisted as JSON on disk."""
+
+    def __init__(
+        self,
+        namespace: str,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        max_entries: int = 1000,
+        cache_dir: Optional[str] = None,
+        exact: bool = False,
+    ) -> None:
+        """
+        Initialize the cache and load any entries persisted for the namespace.
+
+        Args:
+            namespace: Name of the cache; also the file name under the cache directory.
+            threshold: Minimum cosine similarity for a lookup to count as a hit.
+            max_entries: Maximum number of entries kept; the oldest are evicted first.
+            cache_dir: Optional directory override; defaults to CACHE_DIR.
+            exact: Only return entries whose prompt equals the lookup prompt, for
+                answers that depend on the exact wording.
+
+        Raises:
+            ValueError: If namespace is empty or max_entries is not positive.
+        """
+        if not namespace.strip():
+            raise ValueError("Namespace must be a non-empty string.")
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive.")
+
+        self.namespace = namespace
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.exact = exact
+        self.path = os.path.join(cache_dir or CACHE_DIR, f"{namespace}.json")
+        self._lock = threading.Lock()
+        self._entries: List[Dict[str, Any]] = []
+        self._matrix = None
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        self._io_lock = threading.Lock()
+        self._load()
+        atexit.register(self.flush)
+
+    def get(self, prompt: str, scope: str = "") -> Optional[Any]:
+        """
+        Return the cached response for the most similar prompt, if close enough.
+
+        Exact caches only match an identical prompt. Otherwise prompts are compared
+        by hashed character n-grams, so words present only in the query lower the
+        score, and entries of very different length are skipped outright.
+
+        Args:
+            prompt: Prompt text to look up.
+            scope: Optional partition (e.g., an employee name); only entries with the same scope match.
+
+        Returns:
+            The cached response, or None on a miss.
+        """
+        if not prompt.strip():
+            return None
+
+        with self._lock:
+            if self.exact:
+                for e in reversed(self._entries):
+                    if e["scope"] == scope and e["prompt"] == prompt:
+                        logger.info("Semantic cache '%s' exact hit", self.namespace)
+                        return e["response"]
+                return None
+
+            # Prompts much shorter or longer than the query are never close enough
+            candidates = [
+                i for i, e in enumerate(self._entries)
+                if e["scope"] == scope
+                and min(len(e["prompt"]), len(prompt)) >= _MIN_LENGTH_RATIO * max(len(e["prompt"]), len(prompt))
+            ]
+            if not candidates:
+                return None
+            try:
+                if self._matrix is None:
+                    self._matrix = _HASHER.transform([e["prompt"] for e in self._entries])
+                query = _HASHER.transform([prompt])
+                scores = cosine_similarity(query, self._matrix[candidates]).flatten()
+            except ValueError as e:
+                logger.warning("Semantic cache '%s' lookup failed: %s", self.namespace, e)
+                return None
+
+            best = int(scores.argmax())
+            if scores[best] < self.threshold:
+                logger.debug("Semantic cache '%s' miss (best score %.2f)", self.namespace, scores[best])
+                return None
+            logger.info("Semantic cache '%s' hit (score %.2f)", self.namespace, scores[best])
+            return self._entries[candidates[best]]["response"]
+
+    def set(self, prompt: str, response: Any, scope: str = "") -> None:
+        """
+        Store a response; the file is written shortly after, batching nearby sets.
+
+        The hashed prompt matrix is only invalidated here and rebuilt on the next lookup.
+
+        Args:
+            prompt: Prompt text the response answers.
+            response: JSON-serializable response to cache.
+            scope: Optional partition the entry belongs to.
+        """
+        if not prompt.strip():
+            return
+
+        with self._lock:
+            self._entries = [
+                e for e in self._entries if not (e["scope"] == scope and e["prompt"] == prompt)
+            ]
+            self._entries.append({"scope": scope, "prompt": prompt, "response": response})
+            if len(self._entries) > self.max_entries:
+                self._entries = self._entries[-self.max_entries:]
+            self._matrix = None  # Rebuilt on next lookup
+            self._dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(_WRITE_DEBOUNCE, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def flush(self) -> None:
+        """Write pending entries to disk now; a no-op when nothing changed since the last write."""
+        with self._io_lock:
+            with self._lock:
+                if self._save_timer is not None:
+                    self._save_timer.cancel()
+                    self._save_timer = None
+                if not self._dirty:
+                    return
+                self._dirty = False
+                entries = list(self._entries)
+            self._save(entries)
+
+    def _load(self) -> None:
+        """Load persisted entries, starting empty if the file is missing or invalid."""
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, "rb") as f:
+                    self._entries = orjson.loads(f.read())[-self.max_entries:]
+                logger.info("Loaded %s cache entries from %s", len(self._entries), self.path)
+        except (orjson.JSONDecodeError, OSError) as e:
+            logger.error("Failed to load cache from %s: %s", self.path, e)
+            self._entries = []
+
+    def _save(self, entries: List[Dict[str, Any]]) -> None:
+        """Write entries to disk atomically; the caller holds _io_lock."""
+        tmp_path = None
+        try:
+            payload = orjson.dumps(entries, option=orjson.OPT_SERIALIZE_NUMPY)
+            directory = os.path.dirname(self.path) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+            logger.debug("Saved %s cache entries to %s", len(entries), self.path)
+        except (OSError, TypeError) as e:
+            logger.error("Failed to save cache to %s: %s", self.path, e)
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
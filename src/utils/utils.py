@@ -1,19 +1,79 @@
 # src/utils/utils.py
 """
 Utility functions for the Task Manager application.
-Provides JSON parsing, retry logic, and duration parsing.
+Provides JSON parsing, retry logic, direct LLM calls, and duration parsing.
 """
 
 import json
+import asyncio
+import hashlib
+import math
 import re
+import time
+import threading
+import orjson
 import logging
-from typing import Any, Optional, Union
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Tuple, Union
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type, before_sleep_log
+from diskcache import Cache
 import litellm
-from src.config import MAX_RETRIES, MIN_WAIT, MAX_WAIT
+from src.config import MAX_RETRIES, MIN_WAIT, MAX_WAIT, HOURS_PER_DAY, LLM_CACHE_DIR, LLM_CACHE_TTL, LLM_RATE_LIMIT
+from src.config.llm_config import get_completion_kwargs
 
 logger = logging.getLogger(__name__)
 
+def normalize_prompt(text: str) -> str:
+    """
+    Normalize prompt text so trivially different inputs share a cache key.
+
+    Args:
+        text: Raw prompt text.
+
+    Returns:
+        Lowercased text with surrounding and repeated whitespace collapsed.
+    """
+    return " ".join(text.split()).lower()
+
+# A JSON string literal (skipped whole, so braces inside it do not count) or a brace
+_JSON_SCAN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|[{}]')
+
+def _find_json_span(text: str) -> Optional[Tuple[int, int]]:
+    """
+    Locate the first balanced {...} object in text.
+
+    Scans forward from the first "{" tracking brace depth and stops at the
+    matching "}", so trailing log noise with stray braces is ignored. If the
+    object never closes, the span runs to the last "}" instead.
+
+    Args:
+        text: Raw text possibly containing a JSON object.
+
+    Returns:
+        (start, end) slice bounds of the object, or None if text has no "{...}".
+    """
+    start = text.find("{")
+    if start < 0:
+        return None
+    end = _balanced_json_end(text, start)
+    if end is not None:
+        return start, end
+    end = text.rfind("}") + 1
+    return (start, end) if end > start else None
+
+def _balanced_json_end(text: str, start: int) -> Optional[int]:
+    """Return the index just past the "}" closing the "{" at start, or None if it never closes."""
+    depth = 0
+    for match in _JSON_SCAN_RE.finditer(text, start):
+        token = match.group()
+        if token == "{":
+            depth += 1
+        elif token == "}":
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    return None
+
 def parse_json_output(raw_output: str) -> Optional[dict]:
     """
     Parse raw string output into a JSON dictionary.
@@ -29,30 +89,38 @@ def parse_json_output(raw_output: str) -> Optional[dict]:
         return None
 
     try:
-        # Extract JSON substring if embedded in text
-        json_start = raw_output.find("{")
-        json_end = raw_output.rfind("}") + 1
-        if json_start >= 0 and json_end > json_start:
-            json_str = raw_output[json_start:json_end]
-        else:
-            json_str = raw_output.strip()
+        # Extract JSON substring if embedded in text; without a {...} span no dict can parse
+        span = _find_json_span(raw_output)
+        if span is None:
+            logger.warning("No JSON object found in output: %.100s...", raw_output)
+            return None
+        start, end = span
+        # A full-range slice returns raw_output itself, so already-clean output is never copied
+        json_str = raw_output[start:end]
 
-        result = json.loads(json_str)
+        try:
+            result = orjson.loads(json_str)
+        except orjson.JSONDecodeError:
+            result = json.loads(json_str)  # stdlib also accepts NaN/Infinity and arbitrarily large ints
         if not isinstance(result, dict):
-            logger.warning(f"Parsed output is not a dictionary: {json_str[:100]}...")
+            logger.warning("Parsed output is not a dictionary: %.100s...", json_str)
             return None
-        logger.debug(f"Successfully parsed JSON: {json_str[:100]}...")
+        logger.debug("Successfully parsed JSON: %.100s...", json_str)
         return result
     except (json.JSONDecodeError, ValueError) as e:
-        logger.error(f"Failed to parse JSON: {e} - Input: {raw_output[:100]}...")
+        logger.error("Failed to parse JSON: %s - Input: %.100s...", e, raw_output)
         return None
 
-@retry(
+# Shared retry policy for every LLM entry point
+_RETRYABLE_ERRORS = (litellm.RateLimitError, litellm.APIError)
+_llm_retry = retry(
     stop=stop_after_attempt(MAX_RETRIES),
     wait=wait_exponential(multiplier=1, min=MIN_WAIT, max=MAX_WAIT),
-    retry=retry_if_exception_type((litellm.RateLimitError, litellm.APIError)),
+    retry=retry_if_exception_type(_RETRYABLE_ERRORS),
     before_sleep=before_sleep_log(logger, logging.DEBUG)
 )
+
+@_llm_retry
 def call_with_retry(crew: Any, retry_after: Optional[float] = None) -> Any:
     """
     Execute a crew operation with retries on specific exceptions.
@@ -68,10 +136,329 @@ def call_with_retry(crew: Any, retry_after: Optional[float] = None) -> Any:
         Exception: If all retries fail.
     """
     if retry_after is not None and retry_after > 0:
-        logger.debug(f"Delaying execution by {retry_after} seconds")
+        logger.debug("Delaying execution by %s seconds", retry_after)
         time.sleep(retry_after)
+    _LLM_RATE_LIMITER.acquire()
     return crew.kickoff()
 
+@_llm_retry
+async def acall_with_retry(crew: Any, retry_after: Optional[float] = None) -> Any:
+    """
+    Async counterpart of call_with_retry; waits with asyncio.sleep so the event loop stays free.
+
+    Args:
+        crew: Crew object to execute.
+        retry_after: Optional delay (seconds) before execution.
+
+    Returns:
+        Result of crew.kickoff_async() if the crew provides it, else of crew.kickoff() run in a thread.
+
+    Raises:
+        Exception: If all retries fail.
+    """
+    if retry_after is not None and retry_after > 0:
+        logger.debug("Delaying execution by %s seconds", retry_after)
+        await asyncio.sleep(retry_after)
+    await _LLM_RATE_LIMITER.acquire_async()
+    kickoff_async = getattr(crew, "kickoff_async", None)
+    if kickoff_async is not None:
+        return await kickoff_async()
+    return await asyncio.to_thread(crew.kickoff)
+
+class TokenBucket:
+    """Thread-safe token bucket that paces how often LLM requests may start."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second.
+            capacity: Maximum burst size; defaults to one second's worth of tokens.
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _try_take(self) -> float:
+        """Take a token if one is available; return 0.0 on success, else the seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        """Block until a token is available, then take it."""
+        while (wait := self._try_take()) > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Wait without blocking the event loop until a token is available, then take it."""
+        while (wait := self._try_take()) > 0:
+            await asyncio.sleep(wait)
+
+# Shared across threads, so concurrent evaluations honor one provider rate limit; taken once per attempt
+_LLM_RATE_LIMITER = TokenBucket(LLM_RATE_LIMIT)
+
+@lru_cache(maxsize=1)
+def _get_llm_cache() -> Cache:
+    """Open the on-disk completion cache shared by all processes and workers."""
+    return Cache(LLM_CACHE_DIR, size_limit=int(5e9))
+
+def _llm_cache_key(*parts: str) -> bytes:
+    """Hash prompt parts into a compact cache key; blake2b is fast without SHA hardware support."""
+    return hashlib.blake2b("\x1f".join(parts).encode(), digest_size=16).digest()
+
+def _cached_completion(key: bytes, compute, validate: Optional[Callable[[str], bool]] = None) -> str:
+    """
+    Return the cached completion for key, or compute, store, and return it.
+
+    A fresh completion is stored only if it is non-empty and validate accepts it,
+    so output the caller would reject is requested again on the next attempt.
+
+    Args:
+        key: Cache key from _llm_cache_key.
+        compute: Zero-argument callable producing the completion text on a miss.
+        validate: Optional predicate the completion must pass to be cached.
+
+    Returns:
+        The completion text.
+    """
+    cache = _get_llm_cache()
+    hit = cache.get(key)
+    if hit is not None:
+        logger.debug("LLM completion cache hit")
+        return hit
+    content = compute()
+    if content.strip() and (validate is None or validate(content)):
+        cache.set(key, content, expire=LLM_CACHE_TTL)
+    return content
+
+def run_crew(crew: Any, validate: Optional[Callable[[str], bool]] = None) -> str:
+    """
+    Run a crew through call_with_retry, reusing a cached result for identical prompts.
+
+    The key covers the model and every agent's role, goal, and backstory, so a
+    model change or two employees sharing a role never reuse each other's output.
+
+    Args:
+        crew: Crew object to execute.
+        validate: Optional predicate the output must pass to be cached.
+
+    Returns:
+        The stripped raw output of the crew.
+    """
+    key = _llm_cache_key(
+        "crew",
+        get_completion_kwargs()["model"],
+        *(part for agent in crew.agents for part in (agent.role, agent.goal, agent.backstory)),
+        *(task.description for task in crew.tasks),
+    )
+    return _cached_completion(key, lambda: call_with_retry(crew).raw.strip(), validate)
+
+def build_system_prompt(role: str, goal: str, backstory: str) -> str:
+    """Render an agent's role, goal, and backstory as a system prompt."""
+    return f"You are a {role}. {backstory} Your goal: {goal}"
+
+@_llm_retry
+def _complete(system: str, user: str, completion_kwargs: dict) -> str:
+    """Send one system/user prompt to LiteLLM with retries and return the text."""
+    _LLM_RATE_LIMITER.acquire()  # Per attempt, so retries after a 429 are paced too
+    response = litellm.completion(
+        messages=[{"role": "system", "content": system}, {"role": "user", "content": user}],
+        **completion_kwargs,
+    )
+    return response.choices[0].message.content or ""
+
+def direct_llm(system: str, user: str, validate: Optional[Callable[[str], bool]] = None) -> str:
+    """
+    Send a single system/user prompt straight to the LLM, bypassing crewai.Crew.
+
+    Completions are cached on disk (LLM_CACHE_DIR) so repeat prompts are served
+    across reloads, processes, and workers.
+
+    Args:
+        system: System prompt describing the agent.
+        user: User prompt with the task.
+        validate: Optional predicate the completion must pass to be cached.
+
+    Returns:
+        The completion text.
+
+    Raises:
+        Exception: If all retries fail.
+    """
+    completion_kwargs = get_completion_kwargs()
+    key = _llm_cache_key(completion_kwargs["model"], system, user)
+    return _cached_completion(key, lambda: _complete(system, user, completion_kwargs), validate)
+
+@_llm_retry
+def _stream_until(system: str, user: str, completion_kwargs: dict, is_complete: Callable[[str], bool]) -> str:
+    """Stream a completion, closing it as soon as is_complete accepts the text so far."""
+    _LLM_RATE_LIMITER.acquire()
+    stream = litellm.completion(
+        messages=[{"role": "system", "content": system}, {"role": "user", "content": user}],
+        stream=True,
+        **completion_kwargs,
+    )
+    text = ""
+    try:
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            text += delta
+            if is_complete(text):
+                logger.debug("Stopped stream early after %s characters", len(text))
+                break
+    finally:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+    return text
+
+def stream_llm(
+    system: str,
+    user: str,
+    max_tokens: int,
+    is_complete: Callable[[str], bool],
+    validate: Optional[Callable[[str], bool]] = None,
+) -> str:
+    """
+    Stream a system/user prompt and stop generating once the answer is complete.
+
+    Tokens after the answer (extra justification, trailing prose) are never
+    generated, which lowers both latency and token cost. Only text that
+    is_complete accepts is cached; output that ended at max_tokens or with the
+    stream is returned but requested again next time.
+
+    Args:
+        system: System prompt describing the agent.
+        user: User prompt with the task.
+        max_tokens: Upper bound on generated tokens.
+        is_complete: Predicate called on the accumulated text after each delta.
+        validate: Optional predicate the text must pass to be cached.
+
+    Returns:
+        The text received before the stream was closed.
+
+    Raises:
+        Exception: If all retries fail.
+    """
+    completion_kwargs = {**get_completion_kwargs(), "max_tokens": max_tokens}
+    key = _llm_cache_key("stream", completion_kwargs["model"], str(max_tokens), system, user)
+    return _cached_completion(
+        key,
+        lambda: _stream_until(system, user, completion_kwargs, is_complete),
+        # Text cut off by the token cap or a dropped stream never satisfied is_complete
+        lambda text: is_complete(text) and (validate is None or validate(text)),
+    )
+
+def json_object_complete(text: str) -> bool:
+    """
+    Return True once text holds a complete JSON object that parses.
+
+    Braces are matched with the string-aware scanner, so "{" or "}" inside a
+    string value neither ends the stream early nor keeps it open.
+    """
+    start = text.find("{")
+    if start < 0 or text.find("}", start) < 0:
+        return False
+    end = _balanced_json_end(text, start)
+    if end is None:
+        return False
+    try:
+        orjson.loads(text[start:end])
+    except orjson.JSONDecodeError:
+        try:
+            json.loads(text[start:end])  # NaN/Infinity, as accepted by parse_json_output
+        except ValueError:
+            return False
+    return True
+
+def hours_to_days(hours: float, hours_per_day: int = HOURS_PER_DAY) -> int:
+    """
+    Convert an effort estimate into whole workdays.
+
+    Args:
+        hours: Duration in hours.
+        hours_per_day: Working hours in a day; defaults to HOURS_PER_DAY.
+
+    Returns:
+        Number of workdays, rounded up, with a minimum of one.
+    """
+    return max(1, math.ceil(hours / hours_per_day))
+
+# Bounds schemas for duration dicts, probed in order: (lower key, upper key, label for warnings)
+_SCHEMA = (
+    ("lower", "upper", "dict bounds"),
+    ("lower_bound", "upper_bound", "dict bounds"),
+    ("min", "max", "min/max bounds"),
+)
+
+def _parse_dict_bounds(node: dict) -> Tuple[bool, Optional[float]]:
+    """
+    Read a {"lower"/"upper"}, {"lower_bound"/"upper_bound"} or {"min"/"max"} duration.
+
+    Returns:
+        Tuple of (whether a bounds schema matched, midpoint in hours or None if unparseable).
+    """
+    for lower_key, upper_key, label in _SCHEMA:
+        if lower_key in node and upper_key in node:
+            lower, upper = node[lower_key], node[upper_key]
+            if lower is None or upper is None:
+                continue
+            try:
+                return True, (float(lower) + float(upper)) / 2
+            except (ValueError, TypeError) as e:
+                logger.warning("Failed to parse %s '%s': %s", label, node, e)
+                return True, None
+    return False, None
+
+def _parse_duration_dict(root: dict) -> Optional[float]:
+    """
+    Sum every duration in a (possibly nested) duration dict.
+
+    Walks the dict with an explicit stack instead of recursing. A node with
+    bounds contributes their midpoint; otherwise it defers to its "total",
+    its "breakdown" values, or its nested dict values, in that order.
+
+    Returns:
+        Total hours, or None if no duration in the dict parses.
+    """
+    total, found = 0.0, False
+    stack: List[Any] = [root]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            matched, value = _parse_dict_bounds(node)
+            if not matched:
+                breakdown = node.get("breakdown")
+                if node.get("total"):
+                    stack.append(node["total"])
+                elif breakdown and isinstance(breakdown, dict):
+                    stack.extend(reversed([v for v in breakdown.values() if v is not None]))
+                else:
+                    stack.extend(reversed([v for v in node.values() if isinstance(v, dict)]))
+                continue
+        else:
+            value = parse_duration(node)
+        if value is not None:
+            total += value
+            found = True
+    return total if found else None
+
+# Unit suffixes stripped from duration strings, and a single value or "low-high" range
+_UNIT_RE = re.compile(r"\s*(hours|hrs|h)\s*", re.IGNORECASE)
+_NUM = r"(\d+(?:\.\d*)?|\.\d+)"  # Accepts "5", "5.5", "5." and ".5", as float() does
+_RANGE_RE = re.compile(rf"{_NUM}(?:\s*-\s*{_NUM})?")
+
 def parse_duration(duration_input: Union[str, int, float, dict]) -> Optional[float]:
     """
     Parse various duration formats into a float representing hours.
@@ -86,61 +473,18 @@ def parse_duration(duration_input: Union[str, int, float, dict]) -> Optional[flo
         return float(duration_input) if duration_input >= 0 else None
 
     if isinstance(duration_input, dict):
-        # Handle {"lower": X, "upper": Y} or {"lower_bound": X, "upper_bound": Y}
-        lower = duration_input.get("lower") or duration_input.get("lower_bound")
-        upper = duration_input.get("upper") or duration_input.get("upper_bound")
-        if lower is not None and upper is not None:
-            try:
-                return (float(lower) + float(upper)) / 2
-            except (ValueError, TypeError) as e:
-                logger.warning(f"Failed to parse dict bounds '{duration_input}': {e}")
-                return None
-
-        # Handle {"min": X, "max": Y}
-        min_val = duration_input.get("min")
-        max_val = duration_input.get("max")
-        if min_val is not None and max_val is not None:
-            try:
-                return (float(min_val) + float(max_val)) / 2
-            except (ValueError, TypeError) as e:
-                logger.warning(f"Failed to parse min/max bounds '{duration_input}': {e}")
-                return None
-
-        # Handle {"total": "X-Yh"}
-        total = duration_input.get("total")
-        if total:
-            return parse_duration(total)
-
-        # Handle {"breakdown": {"key": "X-Yh", ...}}
-        breakdown = duration_input.get("breakdown")
-        if breakdown and isinstance(breakdown, dict):
-            durations = [parse_duration(v) for v in breakdown.values() if v is not None]
-            valid_durations = [d for d in durations if d is not None]
-            return sum(valid_durations) if valid_durations else None
-
-        # Sum nested dicts like {"API Development": {"lower": X, "upper": Y}, ...}
-        durations = [parse_duration(v) for v in duration_input.values() if isinstance(v, dict)]
-        valid_durations = [d for d in durations if d is not None]
-        return sum(valid_durations) if valid_durations else None
+        return _parse_duration_dict(duration_input)
 
     if isinstance(duration_input, str):
         # Remove units (e.g., 'hours', 'hrs', 'h') and normalize
-        duration_str = re.sub(r'\s*(hours|hrs|h)\s*', '', duration_input, flags=re.IGNORECASE).strip()
-        # Handle range (e.g., '40-80')
-        if '-' in duration_str:
-            try:
-                low, high = map(float, duration_str.split('-'))
-                return (low + high) / 2 if low >= 0 and high >= 0 else None
-            except ValueError:
-                logger.warning(f"Failed to parse range '{duration_str}'")
-                return None
-        # Handle single value (e.g., '50')
-        try:
-            value = float(duration_str)
-            return value if value >= 0 else None
-        except ValueError:
-            logger.warning(f"Failed to parse single value '{duration_str}'")
+        duration_str = _UNIT_RE.sub("", duration_input).strip()
+        # Single value (e.g., '50') or range (e.g., '40-80') in one match
+        match = _RANGE_RE.fullmatch(duration_str)
+        if match is None:
+            logger.warning("Failed to parse duration '%s'", duration_str)
             return None
+        low, high = match.groups()
+        return (float(low) + float(high)) / 2 if high is not None else float(low)
 
-    logger.warning(f"Unsupported duration format: {duration_input}")
+    logger.warning("Unsupported duration format: %s", duration_input)
     return None
\ No newline at end of file